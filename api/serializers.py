@@ -1,34 +1,57 @@
 """Serializers for converting HAL readings to JSON-safe dicts.
 
 HAL sensor readings contain numpy arrays which aren't JSON-serializable.
-These helpers convert everything to plain Python types.
+These helpers convert everything to plain Python types, and dumps()
+encodes whole payloads with orjson, which handles numpy natively.
 """
 
+from functools import singledispatch
+
 import numpy as np
+import orjson
+
+try:
+    import msgpack
+except ImportError:  # optional: only needed for binary WebSocket frames
+    msgpack = None
+
+MSGPACK_AVAILABLE = msgpack is not None
+
+# msgpack extension type code for raw numpy arrays
+NDARRAY_EXT_CODE = 1
+
+
+_ndarray = np.ndarray
 
 
 def _arr(v) -> list:
-    """Convert numpy array or list-like to plain Python list of floats."""
-    if isinstance(v, np.ndarray):
+    """Convert a numpy array to a plain Python list; other values pass through.
+
+    HAL readings always carry plain ndarrays, so an exact type check is
+    used instead of isinstance() to keep the per-field cost minimal.
+    """
+    if type(v) is _ndarray:
         return v.tolist()
-    if isinstance(v, (list, tuple)):
-        return [float(x) for x in v]
     return v
 
 
 def serialize_imu(reading) -> dict:
+    accel = reading.accel
+    gyro = reading.gyro
     return {
         'timestamp': float(reading.timestamp),
-        'accel': _arr(reading.accel),
-        'gyro': _arr(reading.gyro),
+        'accel': accel.tolist() if type(accel) is _ndarray else accel,
+        'gyro': gyro.tolist() if type(gyro) is _ndarray else gyro,
     }
 
 
 def serialize_gps(reading) -> dict:
+    pos = reading.position
+    vel = reading.velocity
     return {
         'timestamp': float(reading.timestamp),
-        'position': _arr(reading.position),
-        'velocity': _arr(reading.velocity),
+        'position': pos.tolist() if type(pos) is _ndarray else pos,
+        'velocity': vel.tolist() if type(vel) is _ndarray else vel,
         'accuracy_h': float(reading.accuracy_h),
         'accuracy_v': float(reading.accuracy_v),
         'fix_type': int(reading.fix_type),
@@ -65,30 +88,62 @@ def serialize_status(reading) -> dict:
 
 def serialize_ground_truth(gt: dict) -> dict:
     """Convert ground truth dict (contains numpy arrays) to JSON-safe dict."""
-    return {k: _arr(v) if isinstance(v, np.ndarray) else v for k, v in gt.items()}
+    return {k: _arr(v) for k, v in gt.items()}
+
+
+@singledispatch
+def _to_jsonable(obj):
+    """orjson fallback for leaves it can't encode natively.
+
+    orjson walks dicts and lists in C and only calls this for unknown
+    leaves. OPT_SERIALIZE_NUMPY covers C-contiguous arrays of common
+    dtypes; strided views and other numpy scalars land here. Register
+    converters for further types with @_to_jsonable.register.
+    """
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+@_to_jsonable.register
+def _(obj: np.ndarray):
+    return obj.tolist()
+
+
+@_to_jsonable.register
+def _(obj: np.generic):
+    return obj.item()
+
 
+def dumps(obj) -> bytes:
+    """Encode obj as JSON bytes; numpy arrays and scalars are encoded natively."""
+    return orjson.dumps(obj, default=_to_jsonable, option=orjson.OPT_SERIALIZE_NUMPY)
 
-def sanitize(obj):
-    """Recursively convert numpy types to plain Python types for JSON."""
+
+def _msgpack_default(obj):
+    """msgpack fallback: ship arrays as raw buffers, unwrap numpy scalars.
+
+    Arrays become ExtType(NDARRAY_EXT_CODE, packb([dtype_str, shape, data]))
+    so clients can rebuild them without parsing decimal text.
+    """
     if isinstance(obj, np.ndarray):
-        return obj.tolist()
-    if isinstance(obj, (np.bool_,)):
-        return bool(obj)
-    if isinstance(obj, (np.integer,)):
-        return int(obj)
-    if isinstance(obj, (np.floating,)):
-        return float(obj)
-    if isinstance(obj, dict):
-        return {k: sanitize(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple)):
-        return [sanitize(x) for x in obj]
-    return obj
+        arr = np.ascontiguousarray(obj)
+        body = msgpack.packb([arr.dtype.str, list(arr.shape), arr.tobytes()],
+                             use_bin_type=True)
+        return msgpack.ExtType(NDARRAY_EXT_CODE, body)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Type is not msgpack serializable: {type(obj).__name__}")
+
+
+def packb(obj) -> bytes:
+    """Encode obj as msgpack bytes (requires the optional msgpack package)."""
+    return msgpack.packb(obj, default=_msgpack_default, use_bin_type=True)
 
 
 def serialize_drone_state(state: dict) -> dict:
     """Convert a drone state dict to JSON-safe dict.
 
     Drone states from get_states() already use plain lists for positions,
-    but this ensures everything is serializable.
+    so only top-level arrays need converting. API routes encode states
+    with dumps() directly and don't need this.
     """
-    return sanitize(state)
+    return {k: _arr(v) for k, v in state.items()}
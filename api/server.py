@@ -6,26 +6,43 @@ HTTP and WebSocket.
 """
 
 import asyncio
-import json
 import time
+from contextlib import asynccontextmanager
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+import numpy as np
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError
 
 from api.serializers import (
-    sanitize,
+    MSGPACK_AVAILABLE,
+    dumps,
+    packb,
     serialize_imu,
     serialize_gps,
     serialize_altitude,
     serialize_battery,
     serialize_status,
-    serialize_ground_truth,
-    serialize_drone_state,
 )
 
 
+# ── JSON responses ───────────────────────────────────────────────
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson.
+
+    Handlers can return simulator dicts containing numpy arrays directly
+    in this response; they are converted during encoding.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
 # ── Pydantic request models ──────────────────────────────────────
 
 class PositionCommand(BaseModel):
@@ -82,30 +99,90 @@ class WindConfigModel(BaseModel):
     gust_frequency: float = 0.1
 
 
+async def _parse_body(request: Request, model):
+    """Validate a JSON request body straight from bytes into model.
+
+    Errors are raised as RequestValidationError so clients still get
+    FastAPI's usual 422 response.
+    """
+    try:
+        return model.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, 'loc': ('body', *err['loc'])}
+             for err in e.errors(include_url=False)]
+        )
+
+
+def _json_body_schema(model) -> dict:
+    """OpenAPI requestBody for routes that parse their body with _parse_body."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
+
 # ── WebSocket connection manager ─────────────────────────────────
 
 class ConnectionManager:
-    """Manages active WebSocket connections and broadcasts state."""
+    """Manages active WebSocket connections and streams state to them.
+
+    The producer publishes each frame once; every client has a long-lived
+    sender (stream()) that wakes on publish and sends the latest payload.
+    Text managers send JSON frames; binary managers send msgpack frames.
+    """
 
-    def __init__(self):
-        self.active: list[WebSocket] = []
+    def __init__(self, binary: bool = False):
+        self.active: set[WebSocket] = set()
+        self.binary = binary
+        self.latest = None
+        # Bumped with every publish; senders compare it to the last frame
+        # they sent, so a frame published mid-send is never missed
+        self._seq = 0
+        self._frame_ready: Optional[asyncio.Event] = None
 
     async def connect(self, ws: WebSocket):
         await ws.accept()
-        self.active.append(ws)
+        self.active.add(ws)
 
     def disconnect(self, ws: WebSocket):
-        if ws in self.active:
-            self.active.remove(ws)
-
-    async def broadcast(self, data: dict):
-        dead = []
-        for ws in self.active:
-            try:
-                await ws.send_json(data)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
+        self.active.discard(ws)
+        if not self.active:
+            # Events bind to the loop that first waits on them; start fresh
+            self._frame_ready = None
+
+    def _frame_event(self) -> asyncio.Event:
+        if self._frame_ready is None:
+            self._frame_ready = asyncio.Event()
+        return self._frame_ready
+
+    def publish(self, data: dict):
+        """Encode a frame once and wake every client's sender."""
+        if not self.active:
+            return
+        self.latest = packb(data) if self.binary else dumps(data).decode()
+        self._seq += 1
+        ready = self._frame_event()
+        self._frame_ready = asyncio.Event()
+        ready.set()
+
+    async def stream(self, ws: WebSocket):
+        """Send each published frame to ws until a send fails.
+
+        A client that is slow to drain skips straight to the newest frame
+        instead of holding up the others.
+        """
+        send = ws.send_bytes if self.binary else ws.send_text
+        sent_seq = self._seq
+        try:
+            while True:
+                while self._seq == sent_seq:
+                    await self._frame_event().wait()
+                sent_seq = self._seq
+                await send(self.latest)
+        except Exception:
             self.disconnect(ws)
 
 
@@ -119,7 +196,15 @@ def create_app(simulator, cors_origins: list = None, ws_push_rate: float = 10.0)
         cors_origins: Allowed CORS origins (default ["*"]).
         ws_push_rate: WebSocket state push rate in Hz (default 10).
     """
-    app = FastAPI(title="Drone Swarm Simulator API", version="1.0.0")
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        # Stop the WebSocket frame producer on shutdown
+        if app.state._ws_task is not None:
+            app.state._ws_task.cancel()
+
+    app = FastAPI(title="Drone Swarm Simulator API", version="1.0.0",
+                  default_response_class=ORJSONResponse, lifespan=lifespan)
 
     # CORS
     origins = cors_origins or ["*"]
@@ -131,27 +216,46 @@ def create_app(simulator, cors_origins: list = None, ws_push_rate: float = 10.0)
     )
 
     manager = ConnectionManager()
+    bin_manager = ConnectionManager(binary=True)
     ws_interval = 1.0 / max(ws_push_rate, 1.0)
 
-    # Store on app state for access in startup event
+    # Store on app state for access from the lifespan handler
     app.state.simulator = simulator
     app.state.manager = manager
+    app.state.bin_manager = bin_manager
     app.state.ws_interval = ws_interval
     app.state._ws_task = None
 
     # ── Helpers ───────────────────────────────────────────────
 
+    # Bound once; per-drone routes and WS commands call this at control rates
+    get_hal = simulator.get_hal
+
     def _get_hal(drone_id: int):
-        hal = simulator.get_hal(drone_id)
+        hal = get_hal(drone_id)
         if hal is None:
             raise HTTPException(status_code=404, detail=f"Drone {drone_id} not found")
         return hal
 
+    # Drone states are snapshotted at most once per sim tick however many
+    # clients poll: (tick, states, {drone_id: state})
+    states_cache = (-1, [], {})
+
+    def _drone_states():
+        nonlocal states_cache
+        cached = states_cache
+        tick = simulator.tick
+        if cached[0] != tick:
+            states = simulator.get_state_arrays().to_dicts()
+            cached = (tick, states, {s['id']: s for s in states})
+            states_cache = cached
+        return cached
+
     # ── Simulation control ───────────────────────────────────
 
     @app.get("/api/sim/info")
     def sim_info():
-        return sanitize(simulator.get_simulation_info())
+        return ORJSONResponse(simulator.get_simulation_info())
 
     @app.post("/api/sim/pause")
     def sim_pause():
@@ -172,59 +276,81 @@ def create_app(simulator, cors_origins: list = None, ws_push_rate: float = 10.0)
 
     @app.get("/api/drones")
     def list_drones():
-        states = simulator.get_drone_states()
-        return [serialize_drone_state(s) for s in states]
+        return ORJSONResponse(_drone_states()[1])
 
     @app.get("/api/drones/{drone_id}")
     def get_drone(drone_id: int):
-        states = simulator.get_drone_states()
-        for s in states:
-            if s['id'] == drone_id:
-                return serialize_drone_state(s)
-        raise HTTPException(status_code=404, detail=f"Drone {drone_id} not found")
+        state = _drone_states()[2].get(drone_id)
+        if state is None:
+            raise HTTPException(status_code=404, detail=f"Drone {drone_id} not found")
+        return ORJSONResponse(state)
 
     # ── Per-drone sensors ────────────────────────────────────
 
+    # Sensor routes are polled at high rate by mission computers, so they
+    # return pre-encoded responses and skip FastAPI's jsonable_encoder pass.
+
+    # GPS is rate-limited, so between fixes the HAL hands back the same
+    # reading; keep its encoded body per drone, keyed on the fix timestamp
+    gps_cache: dict = {}
+
     @app.get("/api/drones/{drone_id}/sensors/imu")
     def drone_imu(drone_id: int):
         hal = _get_hal(drone_id)
-        return serialize_imu(hal.get_imu())
+        return ORJSONResponse(serialize_imu(hal.get_imu()))
 
     @app.get("/api/drones/{drone_id}/sensors/gps")
     def drone_gps(drone_id: int):
         hal = _get_hal(drone_id)
-        return serialize_gps(hal.get_gps())
+        reading = hal.get_gps()
+        cached = gps_cache.get(drone_id)
+        if cached is not None and cached[0] == reading.timestamp:
+            body = cached[1]
+        else:
+            body = dumps(serialize_gps(reading))
+            gps_cache[drone_id] = (reading.timestamp, body)
+        return Response(content=body, media_type="application/json")
 
     @app.get("/api/drones/{drone_id}/sensors/altitude")
     def drone_altitude(drone_id: int):
         hal = _get_hal(drone_id)
-        return serialize_altitude(hal.get_altitude())
+        return ORJSONResponse(serialize_altitude(hal.get_altitude()))
 
     @app.get("/api/drones/{drone_id}/sensors/battery")
     def drone_battery(drone_id: int):
         hal = _get_hal(drone_id)
-        return serialize_battery(hal.get_battery())
+        return ORJSONResponse(serialize_battery(hal.get_battery()))
 
     @app.get("/api/drones/{drone_id}/status")
     def drone_status(drone_id: int):
         hal = _get_hal(drone_id)
-        return serialize_status(hal.get_status())
+        return ORJSONResponse(serialize_status(hal.get_status()))
 
     @app.get("/api/drones/{drone_id}/ground_truth")
     def drone_ground_truth(drone_id: int):
         hal = _get_hal(drone_id)
-        return serialize_ground_truth(hal.get_ground_truth())
+        # orjson writes the float64 buffers straight to JSON; no per-array
+        # tolist() or jsonable_encoder pass
+        return ORJSONResponse(hal.get_ground_truth())
 
     # ── Per-drone commands ───────────────────────────────────
 
-    @app.post("/api/drones/{drone_id}/command/position")
-    def cmd_position(drone_id: int, cmd: PositionCommand):
+    # Position/velocity are the high-rate control paths (e.g. an ESP32 at
+    # 50 Hz): validate the raw body directly instead of via FastAPI's body
+    # dependency, and run on the event loop rather than the threadpool.
+
+    @app.post("/api/drones/{drone_id}/command/position",
+              openapi_extra=_json_body_schema(PositionCommand))
+    async def cmd_position(drone_id: int, request: Request):
+        cmd = await _parse_body(request, PositionCommand)
         hal = _get_hal(drone_id)
         hal.set_position(cmd.x, cmd.y, cmd.z, cmd.yaw)
         return {"status": "ok", "drone_id": drone_id}
 
-    @app.post("/api/drones/{drone_id}/command/velocity")
-    def cmd_velocity(drone_id: int, cmd: VelocityCommand):
+    @app.post("/api/drones/{drone_id}/command/velocity",
+              openapi_extra=_json_body_schema(VelocityCommand))
+    async def cmd_velocity(drone_id: int, request: Request):
+        cmd = await _parse_body(request, VelocityCommand)
         hal = _get_hal(drone_id)
         hal.set_velocity(cmd.vx, cmd.vy, cmd.vz, cmd.yaw_rate)
         return {"status": "ok", "drone_id": drone_id}
@@ -272,7 +398,7 @@ def create_app(simulator, cors_origins: list = None, ws_push_rate: float = 10.0)
     @app.get("/api/obstacles")
     def list_obstacles():
         info = simulator.get_simulation_info()
-        return sanitize(info.get('obstacles', []))
+        return ORJSONResponse(info.get('obstacles', []))
 
     @app.post("/api/obstacles/box")
     def add_box(obs: BoxObstacle):
@@ -299,147 +425,190 @@ def create_app(simulator, cors_origins: list = None, ws_push_rate: float = 10.0)
     @app.get("/api/wind")
     def get_wind():
         w = simulator.environment.wind
-        return sanitize({
+        return ORJSONResponse({
             "enabled": w.enabled,
-            "base_velocity": w.base_velocity.tolist(),
+            "base_velocity": w.base_velocity,
             "gust_magnitude": w.gust_magnitude,
             "gust_frequency": w.gust_frequency,
         })
 
     @app.post("/api/wind")
     def set_wind(cfg: WindConfigModel):
-        import numpy as _np
         w = simulator.environment.wind
         w.enabled = cfg.enabled
-        w.base_velocity = _np.array(cfg.base_velocity, dtype=float)
+        w.base_velocity = np.asarray(cfg.base_velocity, dtype=np.float64)
         w.gust_magnitude = cfg.gust_magnitude
         w.gust_frequency = cfg.gust_frequency
+        simulator.mark_state_changed()
         return {"status": "ok"}
 
     # ── Avoidance ────────────────────────────────────────────
 
     @app.get("/api/avoidance")
     def get_avoidance():
-        hals = simulator.get_all_hals()
-        if not hals:
-            return {"enabled": False}
-        hal = next(iter(hals.values()))
-        ac = hal._drone.controller.avoidance.config
-        return {
-            "enabled": ac.enabled,
-            "sensor_range": ac.sensor_range,
-            "repulsion_gain": ac.repulsion_gain,
-            "velocity_limit": ac.velocity_limit,
-        }
+        return simulator.get_avoidance_config()
 
     @app.post("/api/avoidance")
     def set_avoidance(cfg: AvoidanceConfigModel):
-        hals = simulator.get_all_hals()
-        for hal in hals.values():
-            ac = hal._drone.controller.avoidance.config
-            ac.enabled = cfg.enabled
-            ac.sensor_range = cfg.sensor_range
-            ac.repulsion_gain = cfg.repulsion_gain
-            ac.velocity_limit = cfg.velocity_limit
+        simulator.set_avoidance_config(cfg.enabled, cfg.sensor_range,
+                                       cfg.repulsion_gain, cfg.velocity_limit)
         return {"status": "ok"}
 
     # ── WebSocket ────────────────────────────────────────────
 
     @app.websocket("/api/ws")
     async def websocket_endpoint(ws: WebSocket):
-        await manager.connect(ws)
+        await _serve_ws(ws, manager)
+
+    if MSGPACK_AVAILABLE:
+        @app.websocket("/api/ws/bin")
+        async def websocket_binary_endpoint(ws: WebSocket):
+            """Same stream as /api/ws, as msgpack frames with raw array buffers."""
+            await _serve_ws(ws, bin_manager)
+
+    async def _serve_ws(ws: WebSocket, mgr: ConnectionManager):
+        await mgr.connect(ws)
+        _ensure_ws_producer()
+        sender = asyncio.create_task(mgr.stream(ws))
         try:
+            # State is pushed by the sender task; this loop only reads
+            # commands (JSON text on both endpoints)
             while True:
-                # Receive commands from client (non-blocking with timeout)
-                try:
-                    raw = await asyncio.wait_for(ws.receive_text(), timeout=ws_interval)
-                    _handle_ws_command(raw)
-                except asyncio.TimeoutError:
-                    pass
-
-                # Push current state
-                state_frame = _build_state_frame()
-                await ws.send_json(state_frame)
-
-        except WebSocketDisconnect:
-            manager.disconnect(ws)
+                raw = await ws.receive_text()
+                _handle_ws_command(raw)
+
         except Exception:
-            manager.disconnect(ws)
+            # WebSocketDisconnect, or a broken socket: drop the client
+            pass
+        finally:
+            sender.cancel()
+            mgr.disconnect(ws)
+
+    async def _ws_producer():
+        """Build one state frame per tick and publish it to every client.
+
+        Exits once the last client has disconnected; the next connection
+        starts a fresh producer. A tick that fails is logged and skipped,
+        so one bad frame does not stop pushes to every client.
+        """
+        while manager.active or bin_manager.active:
+            try:
+                frame = _build_state_frame()
+                manager.publish(frame)
+                bin_manager.publish(frame)
+            except Exception as e:
+                print(f"[WS] ERROR building state frame: {e!r}")
+            await asyncio.sleep(ws_interval)
+
+    def _ensure_ws_producer():
+        """Start the frame producer on the running loop if it isn't already."""
+        task = app.state._ws_task
+        # A task bound to another loop is stale (e.g. TestClient runs each
+        # session on its own loop)
+        if (task is None or task.done()
+                or task.get_loop() is not asyncio.get_running_loop()):
+            app.state._ws_task = asyncio.create_task(_ws_producer())
+
+    # WebSocket command handlers, dispatched on msg['action']
+
+    def _ws_set_position(msg: dict):
+        hal = get_hal(msg.get('drone_id', 0))
+        if hal:
+            hal.set_position(
+                msg.get('x', 0), msg.get('y', 0), msg.get('z', 0),
+                msg.get('yaw', 0),
+            )
+
+    def _ws_set_velocity(msg: dict):
+        hal = get_hal(msg.get('drone_id', 0))
+        if hal:
+            hal.set_velocity(
+                msg.get('vx', 0), msg.get('vy', 0), msg.get('vz', 0),
+                msg.get('yaw_rate', 0),
+            )
+
+    def _ws_respawn(msg: dict):
+        simulator.respawn_formation(
+            msg.get('preset', 'line'), msg.get('num_drones')
+        )
+
+    def _ws_arm(msg: dict):
+        hal = get_hal(msg.get('drone_id', 0))
+        if hal:
+            hal.arm()
+
+    def _ws_disarm(msg: dict):
+        hal = get_hal(msg.get('drone_id', 0))
+        if hal:
+            hal.disarm()
+
+    def _ws_takeoff(msg: dict):
+        hal = get_hal(msg.get('drone_id', 0))
+        if hal:
+            hal.takeoff(msg.get('altitude', 10.0))
+
+    def _ws_land(msg: dict):
+        hal = get_hal(msg.get('drone_id', 0))
+        if hal:
+            hal.land()
+
+    def _ws_enable_wind(msg: dict):
+        simulator.environment.wind.enabled = True
+        simulator.mark_state_changed()
+
+    def _ws_disable_wind(msg: dict):
+        simulator.environment.wind.enabled = False
+        simulator.mark_state_changed()
+
+    def _ws_set_wind(msg: dict):
+        w = simulator.environment.wind
+        if 'base_velocity' in msg:
+            w.base_velocity = np.asarray(msg['base_velocity'], dtype=np.float64)
+        if 'gust_magnitude' in msg:
+            w.gust_magnitude = msg['gust_magnitude']
+        if 'gust_frequency' in msg:
+            w.gust_frequency = msg['gust_frequency']
+        if 'enabled' in msg:
+            w.enabled = msg['enabled']
+        simulator.mark_state_changed()
+
+    ws_actions = {
+        'set_position': _ws_set_position,
+        'set_velocity': _ws_set_velocity,
+        'set_formation': lambda msg: simulator.set_formation(msg.get('type', 'line')),
+        'respawn': _ws_respawn,
+        'pause': lambda msg: simulator.pause(),
+        'resume': lambda msg: simulator.resume(),
+        'arm': _ws_arm,
+        'disarm': _ws_disarm,
+        'takeoff': _ws_takeoff,
+        'land': _ws_land,
+        'enable_wind': _ws_enable_wind,
+        'disable_wind': _ws_disable_wind,
+        'set_wind': _ws_set_wind,
+    }
 
     def _handle_ws_command(raw: str):
         """Process a JSON command received over WebSocket."""
         try:
-            msg = json.loads(raw)
-        except json.JSONDecodeError:
+            msg = orjson.loads(raw)
+        except orjson.JSONDecodeError:
             return
 
-        action = msg.get('action')
-        if action == 'set_position':
-            hal = simulator.get_hal(msg.get('drone_id', 0))
-            if hal:
-                hal.set_position(
-                    msg.get('x', 0), msg.get('y', 0), msg.get('z', 0),
-                    msg.get('yaw', 0),
-                )
-        elif action == 'set_velocity':
-            hal = simulator.get_hal(msg.get('drone_id', 0))
-            if hal:
-                hal.set_velocity(
-                    msg.get('vx', 0), msg.get('vy', 0), msg.get('vz', 0),
-                    msg.get('yaw_rate', 0),
-                )
-        elif action == 'set_formation':
-            simulator.set_formation(msg.get('type', 'line'))
-        elif action == 'respawn':
-            simulator.respawn_formation(
-                msg.get('preset', 'line'), msg.get('num_drones')
-            )
-        elif action == 'pause':
-            simulator.pause()
-        elif action == 'resume':
-            simulator.resume()
-        elif action == 'arm':
-            hal = simulator.get_hal(msg.get('drone_id', 0))
-            if hal:
-                hal.arm()
-        elif action == 'disarm':
-            hal = simulator.get_hal(msg.get('drone_id', 0))
-            if hal:
-                hal.disarm()
-        elif action == 'takeoff':
-            hal = simulator.get_hal(msg.get('drone_id', 0))
-            if hal:
-                hal.takeoff(msg.get('altitude', 10.0))
-        elif action == 'land':
-            hal = simulator.get_hal(msg.get('drone_id', 0))
-            if hal:
-                hal.land()
-        elif action == 'enable_wind':
-            simulator.environment.wind.enabled = True
-        elif action == 'disable_wind':
-            simulator.environment.wind.enabled = False
-        elif action == 'set_wind':
-            import numpy as _np
-            w = simulator.environment.wind
-            if 'base_velocity' in msg:
-                w.base_velocity = _np.array(msg['base_velocity'], dtype=float)
-            if 'gust_magnitude' in msg:
-                w.gust_magnitude = msg['gust_magnitude']
-            if 'gust_frequency' in msg:
-                w.gust_frequency = msg['gust_frequency']
-            if 'enabled' in msg:
-                w.enabled = msg['enabled']
+        handler = ws_actions.get(msg.get('action'))
+        if handler is not None:
+            handler(msg)
 
     def _build_state_frame() -> dict:
-        """Build a JSON-safe state frame for WebSocket push."""
-        states = simulator.get_drone_states()
+        """Build a state frame for WebSocket push (encode with dumps())."""
+        states = _drone_states()[1]
         info = simulator.get_simulation_info()
-        return sanitize({
+        return {
             'type': 'state_update',
             'timestamp': time.time(),
             'sim_info': info,
-            'drones': [serialize_drone_state(s) for s in states],
+            'drones': states,
             'obstacles': info.get('obstacles', []),
-        })
+        }
 
     return app
@@ -4,6 +4,7 @@
 import sys
 import os
 import time
+import numpy as np
 import pygame
 from OpenGL.GL import *
 from OpenGL.GLU import *
@@ -33,9 +34,11 @@ def debug_drone_creation():
         print(f"✓ Simulator created")
         print(f"✓ Swarm has {len(sim.swarm.drones)} drones")
         
-        # Check drone positions
-        for i, drone in enumerate(sim.swarm.drones):
-            print(f"  Drone {i}: pos={drone.position}, target={drone.target_position}")
+        # Check drone positions (one snapshot, printed as whole arrays)
+        arrays = sim.get_state_arrays()
+        with np.printoptions(precision=3, suppress=True):
+            print(f"  Positions:\n{arrays.positions}")
+            print(f"  Targets:\n{arrays.targets}")
             
     except Exception as e:
         print(f"✗ Simulator creation failed: {e}")
@@ -63,7 +66,7 @@ def debug_drone_creation():
     if callback_called:
         states, info = callback_data
         print(f"✓ Callback received {len(states)} drone states")
-        for i, state in enumerate(states):
+        for i, state in enumerate(states.to_dicts()):
             pos = state['position']
             print(f"  State {i}: pos=[{pos[0]:.1f}, {pos[1]:.1f}, {pos[2]:.1f}]")
     else:
@@ -100,7 +103,7 @@ def debug_minimal_gui():
         sim = Simulator()
         
         # Store drone states
-        drone_states = []
+        drone_states = sim.get_state_arrays()
         sim_info = {}
         
         def update_callback(states, info):
@@ -143,7 +146,7 @@ def debug_minimal_gui():
             glEnd()
             
             # Draw drones as simple spheres
-            for i, state in enumerate(drone_states):
+            for i, state in enumerate(drone_states.to_dicts()):
                 pos = state['position']
                 color = state['color']
                 
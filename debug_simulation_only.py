@@ -3,6 +3,7 @@
 
 import sys
 import os
+import numpy as np
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 def debug_simulation():
@@ -50,10 +51,11 @@ def debug_simulation():
                      config['drones']['seed'])
         print(f"✓ Created swarm with {len(swarm.drones)} drones")
         
-        # Check initial drone positions
-        print("✓ Initial drone positions:")
-        for i, drone in enumerate(swarm.drones):
-            print(f"  Drone {i}: pos={drone.position}, target={drone.target_position}")
+        # Check initial drone positions (one snapshot, printed as whole arrays)
+        arrays = swarm.get_state_arrays()
+        with np.printoptions(precision=3, suppress=True):
+            print(f"✓ Initial drone positions:\n{arrays.positions}")
+            print(f"✓ Initial targets:\n{arrays.targets}")
         
         # Test update
         swarm.update(0.016)  # 60 FPS = ~0.016 seconds per frame
@@ -63,20 +65,19 @@ def debug_simulation():
         swarm.set_formation('circle')
         print("✓ Set formation to circle")
         
-        print("✓ New target positions:")
-        for i, drone in enumerate(swarm.drones):
-            print(f"  Drone {i}: target={drone.target_position}")
+        with np.printoptions(precision=3, suppress=True):
+            print(f"✓ New target positions:\n{swarm.get_state_arrays().targets}")
         
         # Test respawn
         print("\n--- Testing Respawn ---")
-        old_positions = [drone.position.copy() for drone in swarm.drones]
+        old_positions = swarm.get_state_arrays().positions
         swarm.respawn_formation('grid')
-        new_positions = [drone.position.copy() for drone in swarm.drones]
+        new_positions = swarm.get_state_arrays().positions
         
         print("✓ Respawn completed")
         print("Position changes:")
         for i, (old, new) in enumerate(zip(old_positions, new_positions)):
-            changed = not all(abs(a-b) < 0.001 for a, b in zip(old, new))
+            changed = np.any(np.abs(old - new) >= 0.001)
             status = "CHANGED" if changed else "SAME"
             print(f"  Drone {i}: {old} -> {new} [{status}]")
         
@@ -3,6 +3,8 @@
 This script demonstrates controlling a drone using ONLY the HAL interface,
 which is the same interface that will be used for real hardware.
 No direct access to drone internals (set_target, position, etc).
+Progress is read from HAL GPS into arrays and printed afterwards, so
+console I/O does not stretch the sampling interval.
 
 Usage:
     python examples/hal_demo.py
@@ -12,12 +14,27 @@ import sys
 import os
 import time
 
+import numpy as np
+
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from simulation.simulator import Simulator
 
 
+def record_gps(hal, duration, rate=4.0):
+    """Sample HAL GPS for `duration` seconds; returns (positions, velocities)."""
+    n_samples = int(round(duration * rate))
+    positions = np.empty((n_samples, 3))
+    velocities = np.empty((n_samples, 3))
+    for pos, vel in zip(positions, velocities):
+        time.sleep(1.0 / rate)
+        gps = hal.get_gps()
+        pos[:] = gps.position
+        vel[:] = gps.velocity
+    return positions, velocities
+
+
 def main():
     print("=== HAL Demo: Single Drone Control ===\n")
 
@@ -65,12 +82,11 @@ def main():
     print("\n--- Commanding position [10, 15, 5] via HAL ---")
     hal.set_position(10.0, 15.0, 5.0)
 
-    # Wait and track progress
-    for i in range(20):
-        time.sleep(0.25)
-        gps = hal.get_gps()
-        speed = float(sum(v**2 for v in gps.velocity) ** 0.5)
-        print(f"  t={i*0.25:4.1f}s  pos=[{gps.position[0]:6.2f}, {gps.position[1]:6.2f}, {gps.position[2]:6.2f}]  speed={speed:.2f} m/s")
+    # Wait and track progress (GPS recorded first, printed afterwards)
+    track, velocities = record_gps(hal, 5.0)
+    speeds = np.linalg.norm(velocities, axis=1)
+    for i, (pos, speed) in enumerate(zip(track, speeds)):
+        print(f"  t={i*0.25:4.1f}s  pos=[{pos[0]:6.2f}, {pos[1]:6.2f}, {pos[2]:6.2f}]  speed={speed:.2f} m/s")
 
     # --- Read final state ---
     print("\n--- Final sensor readings ---")
@@ -83,10 +99,9 @@ def main():
     # --- Test velocity command ---
     print("\n--- Testing velocity command [2, 0, 0] for 2s ---")
     hal.set_velocity(2.0, 0.0, 0.0)
-    for i in range(8):
-        time.sleep(0.25)
-        gps = hal.get_gps()
-        print(f"  t={i*0.25:4.1f}s  pos=[{gps.position[0]:6.2f}, {gps.position[1]:6.2f}, {gps.position[2]:6.2f}]")
+    track, _ = record_gps(hal, 2.0)
+    for i, pos in enumerate(track):
+        print(f"  t={i*0.25:4.1f}s  pos=[{pos[0]:6.2f}, {pos[1]:6.2f}, {pos[2]:6.2f}]")
 
     # --- Land and disarm ---
     print("\n--- Landing ---")
@@ -103,9 +118,13 @@ def main():
     print("\n--- Checking HAL for all drones ---")
     all_hals = sim.get_all_hals()
     print(f"Total drones with HAL: {len(all_hals)}")
-    for drone_id, h in sorted(all_hals.items()):
-        gps = h.get_gps()
-        print(f"  Drone {drone_id}: pos=[{gps.position[0]:6.2f}, {gps.position[1]:6.2f}, {gps.position[2]:6.2f}]")
+    # Read every GPS first, then print, so console I/O doesn't spread the reads out
+    drone_ids = sorted(all_hals)
+    positions = np.empty((len(drone_ids), 3))
+    for row, drone_id in zip(positions, drone_ids):
+        row[:] = all_hals[drone_id].get_gps().position
+    for drone_id, pos in zip(drone_ids, positions):
+        print(f"  Drone {drone_id}: pos=[{pos[0]:6.2f}, {pos[1]:6.2f}, {pos[2]:6.2f}]")
 
     sim.stop()
     print("\n=== HAL Demo Complete ===")
@@ -1,7 +1,11 @@
 import math
 import numpy as np
+import pygame
 from OpenGL.GL import *
 from OpenGL.GLU import *
+# Unwrapped entry point: skips PyOpenGL's array-conversion layer, which costs
+# more than the gluLookAt math itself
+from OpenGL.raw.GL.VERSION.GL_1_0 import glLoadMatrixf as _raw_load_matrixf
 
 class Camera:
     """3D Camera with WASD movement, mouse rotation, and scroll zoom."""
@@ -20,6 +24,9 @@ class Camera:
         # Drone locking
         self.locked_drone_id = None
         self.drone_states = []
+        # SoA view of drone_states for locking: ids sorted, positions aligned
+        self._drone_ids = np.empty(0, dtype=np.int64)
+        self._drone_positions = np.empty((0, 3))
         
         # Movement settings
         self.move_speed = 10.0
@@ -31,6 +38,11 @@ class Camera:
         self.last_mouse_x = 0
         self.last_mouse_y = 0
         self.mouse_dragging = False
+        self._move_buf = np.empty(3)
+        
+        # Cached view matrix (column-major) and the eye/target/up it was built from
+        self._view_mat = (GLfloat * 16)()
+        self._view_key = None
         
         # Spherical coordinates for orbiting
         self.distance = np.linalg.norm(self.position - self.target)
@@ -39,12 +51,29 @@ class Camera:
         
         self._update_position_from_spherical()
         
+    def reset(self, position, target):
+        """Re-aim the camera in place, as if newly constructed.
+
+        Keeps the arrays, drone states and settings; clears any drone lock.
+        """
+        self.position[:] = position
+        self.target[:] = target
+        self.up[:] = (0.0, 1.0, 0.0)
+        self.target_position[:] = self.position
+        self.target_target[:] = self.target
+        self.locked_drone_id = None
+        self.distance = np.linalg.norm(self.position - self.target)
+        self.theta = math.pi / 2
+        self.phi = math.pi / 4
+        self._update_position_from_spherical()
+        
     def _update_position_from_spherical(self):
-        """Update camera position based on spherical coordinates."""
-        x = self.target[0] + self.distance * math.sin(self.phi) * math.cos(self.theta)
-        y = self.target[1] + self.distance * math.cos(self.phi)
-        z = self.target[2] + self.distance * math.sin(self.phi) * math.sin(self.theta)
-        self.position = np.array([x, y, z])
+        """Update camera position based on spherical coordinates (in place)."""
+        tx, ty, tz = self.target.tolist()
+        r = self.distance * math.sin(self.phi)
+        self.position[:] = (tx + r * math.cos(self.theta),
+                            ty + self.distance * math.cos(self.phi),
+                            tz + r * math.sin(self.theta))
         
     def handle_mouse_motion(self, dx, dy, dragging):
         """Handle mouse movement for camera rotation."""
@@ -64,55 +93,68 @@ class Camera:
         self._update_position_from_spherical()
         
     def handle_keyboard(self, keys, dt):
-        """Handle keyboard input for camera movement."""
+        """Handle keyboard input for camera movement.
+
+        Args:
+            keys: Held-key state indexed by pygame keycode.
+            dt: Frame time in seconds.
+
+        Works on Python scalars: at 3 elements, numpy dispatch and
+        temporaries cost far more than the arithmetic.
+        """
+        f = keys[pygame.K_w] - keys[pygame.K_s]
+        r = keys[pygame.K_d] - keys[pygame.K_a]
+        u = keys[pygame.K_q] - keys[pygame.K_e]
+        if not (f or r or u):
+            return
         move_speed = self.move_speed * dt
         
         # Calculate camera vectors
-        forward = self.target - self.position
-        forward_norm = np.linalg.norm(forward)
-        if forward_norm > 0:
-            forward = forward / forward_norm
+        px, py, pz = self.position
+        tx, ty, tz = self.target
+        fx, fy, fz = tx - px, ty - py, tz - pz
+        norm = math.sqrt(fx * fx + fy * fy + fz * fz)
+        if norm > 0:
+            fx, fy, fz = fx / norm, fy / norm, fz / norm
         else:
-            forward = np.array([0, 0, -1])  # Default forward direction
+            fx, fy, fz = 0.0, 0.0, -1.0  # Default forward direction
             
-        right = np.cross(forward, self.up)
-        right_norm = np.linalg.norm(right)
-        if right_norm > 0:
-            right = right / right_norm
+        ux, uy, uz = self.up
+        rx, ry, rz = fy * uz - fz * uy, fz * ux - fx * uz, fx * uy - fy * ux
+        norm = math.sqrt(rx * rx + ry * ry + rz * rz)
+        if norm > 0:
+            rx, ry, rz = rx / norm, ry / norm, rz / norm
         else:
-            right = np.array([1, 0, 0])  # Default right direction
-        
-        # Movement
-        movement = np.zeros(3)
-        
-        if keys.get('w', False):
-            movement += forward * move_speed
-        if keys.get('s', False):
-            movement -= forward * move_speed
-        if keys.get('a', False):
-            movement -= right * move_speed
-        if keys.get('d', False):
-            movement += right * move_speed
-        if keys.get('q', False):
-            movement += self.up * move_speed
-        if keys.get('e', False):
-            movement -= self.up * move_speed
-            
-        # Apply movement to both position and target
+            rx, ry, rz = 1.0, 0.0, 0.0  # Default right direction
+        
+        # Movement, applied in place to both position and target. A pure
+        # translation leaves distance/theta/phi unchanged.
+        f *= move_speed
+        r *= move_speed
+        u *= move_speed
+        movement = self._move_buf
+        movement[0] = f * fx + r * rx + u * ux
+        movement[1] = f * fy + r * ry + u * uy
+        movement[2] = f * fz + r * rz + u * uz
         self.position += movement
         self.target += movement
-        
-        # Update spherical coordinates
-        direction = self.position - self.target
-        self.distance = np.linalg.norm(direction)
-        if self.distance > 0:
-            direction = direction / self.distance
-            self.phi = math.acos(np.clip(direction[1], -1, 1))
-            self.theta = math.atan2(direction[2], direction[0])
             
     def set_drone_states(self, drone_states):
-        """Update drone states for camera locking."""
+        """Update drone states (a SwarmStateArrays snapshot) for camera locking."""
         self.drone_states = drone_states
+        ids = drone_states.ids
+        positions = drone_states.positions
+        order = np.argsort(ids)
+        self._drone_ids = ids[order]
+        self._drone_positions = positions[order]
+
+    def _find_drone_position(self, drone_id):
+        """Binary-search the sorted ids; returns the drone position or None."""
+        ids = self._drone_ids
+        idx = np.searchsorted(ids, drone_id)
+        if idx < len(ids) and ids[idx] == drone_id:
+            return self._drone_positions[idx]
+        return None
         
     def lock_to_drone(self, drone_id):
         """Lock camera to follow a specific drone."""
@@ -121,7 +163,7 @@ class Camera:
             return
             
         # Check if drone exists
-        if any(drone['id'] == drone_id for drone in self.drone_states):
+        if self._find_drone_position(drone_id) is not None:
             self.locked_drone_id = drone_id
         else:
             self.locked_drone_id = None
@@ -137,61 +179,87 @@ class Camera:
             
         # Handle drone locking
         if self.locked_drone_id is not None:
-            locked_drone = next((drone for drone in self.drone_states 
-                               if drone['id'] == self.locked_drone_id), None)
-            if locked_drone:
-                drone_pos = np.array(locked_drone['position'])
-                # Set target to drone position with slight offset
-                self.target_target = drone_pos
+            drone_pos = self._find_drone_position(self.locked_drone_id)
+            if drone_pos is not None:
+                # Copy in place: drone_pos is a row of the lookup array
+                self.target_target[:] = drone_pos
                 # Keep camera at relative position
                 offset = self.position - self.target
-                self.target_position = drone_pos + offset
+                np.add(drone_pos, offset, out=self.target_position)
                 
-        # Smooth interpolation
-        self.position += (self.target_position - self.position) * self.smoothing_factor
-        self.target += (self.target_target - self.target) * self.smoothing_factor
+        # Smooth interpolation, in place, on scalars (see handle_keyboard)
+        f = self.smoothing_factor
+        px, py, pz = self.position.tolist()
+        qx, qy, qz = self.target_position.tolist()
+        px, py, pz = px + (qx - px) * f, py + (qy - py) * f, pz + (qz - pz) * f
+        self.position[:] = (px, py, pz)
+        tx, ty, tz = self.target.tolist()
+        qx, qy, qz = self.target_target.tolist()
+        tx, ty, tz = tx + (qx - tx) * f, ty + (qy - ty) * f, tz + (qz - tz) * f
+        self.target[:] = (tx, ty, tz)
         
         # Update spherical coordinates based on current position
-        direction = self.position - self.target
-        self.distance = np.linalg.norm(direction)
+        dx, dy, dz = px - tx, py - ty, pz - tz
+        self.distance = math.sqrt(dx * dx + dy * dy + dz * dz)
         if self.distance > 0:
-            direction = direction / self.distance
-            self.phi = math.acos(np.clip(direction[1], -1, 1))
-            self.theta = math.atan2(direction[2], direction[0])
+            self.phi = math.acos(max(-1.0, min(1.0, dy / self.distance)))
+            self.theta = math.atan2(dz, dx)
             
     def apply_view_matrix(self):
-        """Apply the camera transformation to OpenGL."""
-        gluLookAt(
-            self.position[0], self.position[1], self.position[2],
-            self.target[0], self.target[1], self.target[2],
-            self.up[0], self.up[1], self.up[2]
+        """Apply the camera transformation to OpenGL.
+
+        Replaces the modelview matrix (the renderer loads identity first).
+        The matrix is rebuilt only when eye, target or up changed since the
+        last frame; a static camera reloads the cached one.
+        """
+        key = (*self.position.tolist(), *self.target.tolist(), *self.up.tolist())
+        if key != self._view_key:
+            self._build_view_matrix(*key)
+            self._view_key = key
+        _raw_load_matrixf(self._view_mat)
+
+    def _build_view_matrix(self, ex, ey, ez, tx, ty, tz, ux, uy, uz):
+        """Fill _view_mat with the gluLookAt matrix for the given vectors."""
+        fx, fy, fz = tx - ex, ty - ey, tz - ez
+        norm = math.sqrt(fx * fx + fy * fy + fz * fz) or 1.0
+        fx, fy, fz = fx / norm, fy / norm, fz / norm
+        # right = forward x up, up' = right x forward
+        sx, sy, sz = fy * uz - fz * uy, fz * ux - fx * uz, fx * uy - fy * ux
+        norm = math.sqrt(sx * sx + sy * sy + sz * sz) or 1.0
+        sx, sy, sz = sx / norm, sy / norm, sz / norm
+        vx, vy, vz = sy * fz - sz * fy, sz * fx - sx * fz, sx * fy - sy * fx
+        self._view_mat[:] = (
+            sx, vx, -fx, 0.0,
+            sy, vy, -fy, 0.0,
+            sz, vz, -fz, 0.0,
+            -(sx * ex + sy * ey + sz * ez),
+            -(vx * ex + vy * ey + vz * ez),
+            fx * ex + fy * ey + fz * ez,
+            1.0,
         )
 
     @staticmethod
     def get_fpv_view(drone_state):
         """Compute FPV camera parameters from drone state.
 
+        Plain float tuples: gluLookAt takes scalars, so no arrays are built.
+
         Args:
             drone_state: Dict with 'position' and 'orientation' keys.
 
         Returns:
             (eye, center, up) tuple for gluLookAt.
         """
-        pos = np.array(drone_state['position'])
+        px, py, pz = drone_state['position']
         yaw = drone_state['orientation'][2]  # [roll, pitch, yaw]
+        s, c = math.sin(yaw), math.cos(yaw)
 
-        forward = np.array([math.sin(yaw), 0.0, math.cos(yaw)])
-        eye = pos + np.array([0.0, 0.5, 0.0]) + forward * 1.5  # above and in front
-        center = eye + forward * 5.0
-        up = np.array([0.0, 1.0, 0.0])
-        return eye, center, up
+        # Above and in front of the drone, looking along its heading
+        ex, ey, ez = px + s * 1.5, py + 0.5, pz + c * 1.5
+        return (ex, ey, ez), (ex + s * 5.0, ey, ez + c * 5.0), (0.0, 1.0, 0.0)
 
     @staticmethod
     def apply_fpv_view(drone_state):
         """Apply FPV camera directly to OpenGL."""
-        eye, center, up = Camera.get_fpv_view(drone_state)
-        gluLookAt(
-            eye[0], eye[1], eye[2],
-            center[0], center[1], center[2],
-            up[0], up[1], up[2],
-        )
\ No newline at end of file
+        (ex, ey, ez), (cx, cy, cz), (ux, uy, uz) = Camera.get_fpv_view(drone_state)
+        gluLookAt(ex, ey, ez, cx, cy, cz, ux, uy, uz)
@@ -5,6 +5,7 @@ buttons, and D-pad with deadzone filtering and button edge detection.
 Supports hot-plug connect/disconnect at runtime.
 """
 
+import math
 import time
 import pygame
 
@@ -28,6 +29,7 @@ class GamepadManager:
         config = config or {}
         self.enabled = config.get('enabled', True)
         self.deadzone = config.get('deadzone', 0.15)
+        self._deadzone_scale = 1.0 / (1.0 - self.deadzone)
         self.stick_sensitivity = config.get('stick_sensitivity', 1.0)
         self.trigger_sensitivity = config.get('trigger_sensitivity', 1.0)
         self.invert_right_y = config.get('invert_right_y', False)
@@ -37,6 +39,10 @@ class GamepadManager:
 
         self.joystick = None
         self.connected = False
+        # Layout is fixed per device; read once at connect, not per frame
+        self._num_axes = 0
+        self._num_buttons = 0
+        self._num_hats = 0
         self._last_hotplug_check = 0.0
         self._hotplug_interval = 1.0
 
@@ -66,6 +72,9 @@ class GamepadManager:
             if count > 0 and self.joystick is None:
                 self.joystick = pygame.joystick.Joystick(0)
                 self.joystick.init()
+                self._num_axes = self.joystick.get_numaxes()
+                self._num_buttons = self.joystick.get_numbuttons()
+                self._num_hats = self.joystick.get_numhats()
                 self.connected = True
                 name = self.joystick.get_name()
                 print(f"[GAMEPAD] Connected: {name}")
@@ -93,9 +102,9 @@ class GamepadManager:
         self.left_trigger = 0.0
         self.right_trigger = 0.0
         self.dpad = (0, 0)
-        self.buttons_pressed = {}
-        self.buttons_held = {}
-        self._prev_buttons = {}
+        self.buttons_pressed.clear()
+        self.buttons_held.clear()
+        self._prev_buttons.clear()
 
     def check_hotplug(self, current_time, force=False):
         """Periodically check for controller connect/disconnect."""
@@ -125,17 +134,18 @@ class GamepadManager:
         if not self.connected or self.joystick is None:
             return
 
+        joystick = self.joystick
         try:
             # Read analog sticks
-            num_axes = self.joystick.get_numaxes()
+            num_axes = self._num_axes
             if num_axes >= 2:
-                lx = self._apply_deadzone(self.joystick.get_axis(0))
-                ly = self._apply_deadzone(self.joystick.get_axis(1))
+                lx = self._apply_deadzone(joystick.get_axis(0))
+                ly = self._apply_deadzone(joystick.get_axis(1))
                 self.left_stick = (lx * self.stick_sensitivity,
                                    ly * self.stick_sensitivity)
             if num_axes >= 4:
-                rx = self._apply_deadzone(self.joystick.get_axis(2))
-                ry = self._apply_deadzone(self.joystick.get_axis(3))
+                rx = self._apply_deadzone(joystick.get_axis(2))
+                ry = self._apply_deadzone(joystick.get_axis(3))
                 if self.invert_right_y:
                     ry = -ry
                 self.right_stick = (rx * self.stick_sensitivity,
@@ -144,25 +154,29 @@ class GamepadManager:
             # Read triggers (axis 4 = left, axis 5 = right)
             if num_axes >= 6:
                 self.left_trigger = self._normalize_trigger(
-                    self.joystick.get_axis(4)) * self.trigger_sensitivity
+                    joystick.get_axis(4)) * self.trigger_sensitivity
                 self.right_trigger = self._normalize_trigger(
-                    self.joystick.get_axis(5)) * self.trigger_sensitivity
+                    joystick.get_axis(5)) * self.trigger_sensitivity
 
             # Read D-pad (hat 0)
-            if self.joystick.get_numhats() > 0:
-                self.dpad = self.joystick.get_hat(0)
-
-            # Read buttons with edge detection
-            self.buttons_pressed = {}
-            num_buttons = self.joystick.get_numbuttons()
-            new_held = {}
-            for i in range(num_buttons):
-                if self.joystick.get_button(i):
-                    new_held[i] = True
-                    if not self._prev_buttons.get(i, False):
-                        self.buttons_pressed[i] = True
-            self._prev_buttons = self.buttons_held
-            self.buttons_held = new_held
+            if self._num_hats > 0:
+                self.dpad = joystick.get_hat(0)
+
+            # Read buttons with edge detection. The dicts are reused: last
+            # frame's held set becomes prev, the old prev is refilled.
+            pressed = self.buttons_pressed
+            pressed.clear()
+            prev = self.buttons_held
+            held = self._prev_buttons
+            held.clear()
+            get_button = joystick.get_button
+            for i in range(self._num_buttons):
+                if get_button(i):
+                    held[i] = True
+                    if i not in prev:
+                        pressed[i] = True
+            self._prev_buttons = prev
+            self.buttons_held = held
 
         except Exception:
             # Controller likely disconnected mid-read
@@ -170,10 +184,10 @@ class GamepadManager:
 
     def _apply_deadzone(self, value):
         """Apply deadzone with linear remapping to avoid jump artifact."""
-        if abs(value) < self.deadzone:
+        deadzone = self.deadzone
+        if abs(value) < deadzone:
             return 0.0
-        sign = 1.0 if value > 0 else -1.0
-        return sign * (abs(value) - self.deadzone) / (1.0 - self.deadzone)
+        return (value - math.copysign(deadzone, value)) * self._deadzone_scale
 
     def _normalize_trigger(self, raw):
         """Convert trigger axis from -1..1 (rest at -1) to 0..1."""
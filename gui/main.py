@@ -1,8 +1,10 @@
+import math
 import pygame
 import sys
-import yaml
 import time
 import threading
+from dataclasses import replace
+from functools import partial
 import numpy as np
 from OpenGL.GL import *
 from OpenGL.GLU import *
@@ -12,26 +14,82 @@ try:
     from gui.renderer_optimized import Renderer
 except ImportError:
     from gui.renderer import Renderer  # Fallback to original
-from gui.overlay import TextOverlay
+from gui.overlay import TextOverlay, HELP_LINES
 from gui.gamepad import GamepadManager
+from simulation.config import load_config
+from simulation.coords import get_bounding_box, calculate_camera_distance
 from simulation.simulator import Simulator
 
+# Number keys 1-5: keycode -> (formation to fly, preset to respawn with Shift)
+_FORMATION_KEYS = {
+    pygame.K_1: ('line', 'line'),
+    pygame.K_2: ('circle', 'circle'),
+    pygame.K_3: ('grid', 'grid'),
+    pygame.K_4: ('v_formation', 'v'),
+    pygame.K_5: (None, 'random'),
+}
+
+# Number keys 6-9 lock the camera on drone IDs 5-8
+_DRONE_LOCK_KEYS = (pygame.K_6, pygame.K_7, pygame.K_8, pygame.K_9)
+
+# Startup console text, written in one call; the key list is the help
+# overlay's, so the two cannot drift apart
+_CONTROLS_TEXT = "\n".join(HELP_LINES) + """
+
+GUI Enhancements:
+  - FPS counter and simulation time display
+  - Drone ID labels above each drone
+  - Enhanced formation visualization
+  - Smooth camera interpolation
+  - Interactive pause/step controls
+  - Comprehensive help overlay (press H)
+"""
+
+# Frame pacing: sleep until this long before the frame deadline, then spin
+_SPIN_MARGIN = 0.002
+
+# The HUD's FPS figure is refreshed this often, so the overlay text (and
+# texture) stays unchanged between refreshes
+_HUD_FPS_PERIOD = 0.25
+
+# Loop period while a paused, unchanged scene is not being redrawn and
+# neither the frame cap nor a vsynced swap paces the loop
+_IDLE_FRAME_PERIOD = 1.0 / 60.0
+
+# Loop period while the window is minimized or hidden (nothing is drawn;
+# events are still pumped so the app stays responsive)
+_HIDDEN_FRAME_PERIOD = 0.05
+
 class DroneSwarmGUI:
     """Main GUI class for 3D drone swarm visualization."""
     
-    def __init__(self, config_path="config.yaml"):
-        # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+    def __init__(self, config_path="config.yaml", config=None):
+        # Load configuration (skipped when the caller already parsed it)
+        self.config = config if config is not None else load_config(config_path)
             
         self.gui_config = self.config['gui']
         self.width = self.gui_config['window_width']
         self.height = self.gui_config['window_height']
         self.background_color = self.gui_config['background_color']
         
+        self.drone_size = self.config['drones']['size']
+
+        # Frame pacing (see gui.vsync / max_fps / single_buffer in config.yaml)
+        self.max_fps = self.gui_config.get('max_fps', 60)
+        # Uncapped loops pump SDL events at most this often (see _events_due)
+        self._event_period = 1.0 / self.gui_config.get('event_poll_rate', 120)
+        
         # Initialize pygame and OpenGL
         pygame.init()
-        pygame.display.set_mode((self.width, self.height), pygame.DOUBLEBUF | pygame.OPENGL | pygame.RESIZABLE)
+        self._init_display()
+        # Only event types with a handler are queued; SDL drops the rest
+        # (text input fires on every key press; joystick motion streams
+        # while a stick is held, but the gamepad is polled directly; window,
+        # audio and touch events are never read). Key releases are not
+        # needed: SDL keeps its held-key array current without KEYUP.
+        self._event_handlers = self._build_event_handlers()
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(list(self._event_handlers))
         pygame.display.set_caption("Drone Swarm 3D Simulator")
         
         # Initialize components
@@ -39,6 +97,8 @@ class DroneSwarmGUI:
         smoothing_factor = self.gui_config.get('camera_smoothing', 0.1)
         self.camera = Camera([15, 15, 15], [0, 5, 0], smooth_camera, smoothing_factor)
         self.renderer = Renderer(self.width, self.height, self.background_color)
+        # Optimized renderer (array snapshots) vs. the per-drone fallback
+        self._batched_renderer = hasattr(self.renderer, 'begin_unlit_section')
         # Convert HUD color from 0-1 range to 0-255 range for pygame
         hud_color_01 = self.gui_config.get('hud_color', [1.0, 1.0, 1.0])
         hud_color_255 = tuple(int(c * 255) for c in hud_color_01)
@@ -47,11 +107,12 @@ class DroneSwarmGUI:
                                  hud_color_255)
         
         # Initialize simulation
-        self.simulator = Simulator(config_path)
+        self.simulator = Simulator(config_path, self.config)
         self.simulator.set_state_callback(self.on_simulation_update)
         
         # Store up_axis for camera framing
         self.up_axis = self.gui_config.get('up_axis', 'y')
+        self._up_axis_label = f"Up-axis: {self.up_axis.upper()}"
         
         # GUI state
         self.running = True
@@ -67,32 +128,73 @@ class DroneSwarmGUI:
         self.show_help = self.gui_config.get('show_help', False)
         self.enable_overlay = self.gui_config.get('enable_overlay', True)
         
-        # Input state
-        self.keys_pressed = {}
+        # Input state: SDL's held-key array indexed by keycode, refreshed
+        # once per frame in update()
+        self.keys_pressed = pygame.key.get_pressed()
+        self._key_actions = self._build_key_actions()
         self.mouse_dragging = False
         self.last_mouse_pos = (0, 0)
+        # Orbit drag accumulated over a frame's motion events, applied in update()
+        self._mouse_dx = 0
+        self._mouse_dy = 0
         
-        # Current drone states
-        self.drone_states = []
+        # Current drone states (SwarmStateArrays snapshot from the sim thread)
+        self.drone_states = self.simulator.get_state_arrays()
+        self.camera.set_drone_states(self.drone_states)
+        # Snapshot arrival time (perf_counter), for render-time extrapolation
+        self._state_time = time.perf_counter()
+        self.extrapolate_states = self.gui_config.get('extrapolate_states', True)
+        # Extrapolate at most two sim ticks past a snapshot
+        self._max_extrapolation = 2.0 / self.config['simulation']['update_rate']
+        # The snapshot as drawn this frame (extrapolated, see update());
+        # the camera lock and FPV view follow it too, so they stay on the
+        # drawn drones
+        self._frame_states = self.drone_states
+        # HUD settled count, recounted only when a new snapshot arrives
+        self._settled_count = int(np.count_nonzero(self.drone_states.settled))
         self.sim_info = {}
+        # Newest (drone_states, sim_info, arrival time) from the sim thread,
+        # taken by the GUI thread in update()
+        self._snapshot_lock = threading.Lock()
+        self._pending_snapshot = None
+        # sim_info fields render() needs, copied out once per state push
+        self._current_formation = ''
+        self._sim_paused = False
+        self._spawn_label = "Spawn: unknown"
+        # Redraw tracking for a paused scene (see _needs_redraw): set by
+        # state pushes, input events and key actions
+        self._scene_dirty = True
+        self._drawn_view = None
+        # False while the window is minimized or hidden; nothing is drawn
+        self._window_visible = True
 
         # Obstacle state
         self.show_obstacles = True
         self.obstacle_type = 'box'  # current placement type: 'box' or 'cylinder'
         self.obstacle_states = []
         
-        # Timing
-        self.clock = pygame.time.Clock()
-        self.start_time = time.time()
-        self.frame_count = 0
-        self.fps = 0.0
-        self.last_fps_update = time.time()
+        # Timing (frame pacing: see _pace_frame). All GUI timers run on
+        # perf_counter; _last_frame_time doubles as the per-frame "now"
+        self._last_frame_time = time.perf_counter()
+        self._next_frame_time = self._last_frame_time
+        self._next_event_pump = self._last_frame_time
+        self.frame_dt = 1.0 / 60.0
+        self.start_time = self._last_frame_time
+        # FPS readout: exponential moving average of the frame time
+        self._avg_frame_dt = self.frame_dt
+        self.fps = 1.0 / self._avg_frame_dt
+        self._hud_fps = self.fps
+        self._hud_fps_time = self._last_frame_time
         
         # Gamepad controller
         gamepad_config = self.config.get('gamepad', {})
         self.gamepad = GamepadManager(gamepad_config)
         self._formation_cycle_index = 0
         self._formation_list = ['line', 'circle', 'grid', 'v_formation', 'idle']
+        # Last frame's D-pad, for edge detection; None until first polled
+        # in placement mode, so a held pad does not fire on entry
+        self._gp_dpad_prev = (0, 0)
+        self._gp_dpad_prev_x = None
 
         # Placement mode state
         self.placement_mode = False
@@ -114,21 +216,64 @@ class DroneSwarmGUI:
         # Auto-spawn flag
         self.auto_spawn_triggered = False
         
+        # Scratch vector for frame_swarm's camera position
+        self._frame_scratch = np.empty(3)
+
         # Diagnostic logging
-        self.last_diagnostic_log = time.time()
+        self.last_diagnostic_log = time.perf_counter()
         self.diagnostic_interval = 5.0  # Log every 5 seconds
         
         # Watchdog for monitoring simulation thread
-        self._watchdog_next = time.time() + 1.0
+        self._watchdog_next = time.perf_counter() + 1.0
         
         # CRITICAL: Start simulator thread immediately after initialization
         self._ensure_simulator_started()
         
+    def _init_display(self):
+        """Create the OpenGL window with the configured swap behaviour."""
+        flags = pygame.OPENGL | pygame.RESIZABLE
+        if self.gui_config.get('single_buffer', False):
+            # Latency mode: render straight to the front buffer (may flicker)
+            pygame.display.gl_set_attribute(pygame.GL_DOUBLEBUFFER, 0)
+        else:
+            flags |= pygame.DOUBLEBUF
+        vsync = 1 if self.gui_config.get('vsync', False) else 0
+        try:
+            pygame.display.set_mode((self.width, self.height), flags, vsync=vsync)
+        except pygame.error as e:
+            print(f"[GUI] VSync unavailable ({e}), continuing without it")
+            pygame.display.set_mode((self.width, self.height), flags)
+            vsync = 0
+        # With vsync the swap blocks until the next refresh, which already
+        # paces the loop; _pace_frame then only measures frame time
+        self._swap_paced = bool(vsync)
+
     def on_simulation_update(self, drone_states, sim_info):
-        """Callback for receiving simulation updates."""
+        """Callback for receiving simulation updates (runs on the sim thread).
+
+        Only hands the snapshot over; the GUI thread picks it up at the start
+        of its next update(), so render() never sees a half-applied state.
+        """
+        snapshot = (drone_states, sim_info, time.perf_counter())
+        with self._snapshot_lock:
+            self._pending_snapshot = snapshot
+
+    def _apply_pending_snapshot(self):
+        """Take the newest state pushed by the sim thread, if any."""
+        with self._snapshot_lock:
+            snapshot = self._pending_snapshot
+            self._pending_snapshot = None
+        if snapshot is None:
+            return
+        drone_states, sim_info, self._state_time = snapshot
+        self._settled_count = int(np.count_nonzero(drone_states.settled))
         self.drone_states = drone_states
         self.sim_info = sim_info
+        self._current_formation = sim_info.get('current_formation', '')
+        self._sim_paused = sim_info.get('paused', False)
+        self._spawn_label = f"Spawn: {sim_info.get('spawn_preset', 'unknown')}"
         self.obstacle_states = sim_info.get('obstacles', [])
+        self._scene_dirty = True
     
     def _ensure_simulator_started(self):
         """Ensure simulator thread is started - can be called multiple times safely."""
@@ -138,7 +283,6 @@ class DroneSwarmGUI:
             self.simulator.start()
             
             # Verify thread actually started
-            import time
             time.sleep(0.1)  # Give thread time to start
             
             if self.simulator.is_alive():
@@ -151,82 +295,112 @@ class DroneSwarmGUI:
 
     def _watchdog_tick(self):
         """Monitor simulation thread health - log every second."""
-        if time.time() < self._watchdog_next:
+        now = self._last_frame_time
+        if now < self._watchdog_next:
             return
-        self._watchdog_next = time.time() + 1.0
+        self._watchdog_next = now + 1.0
         
         alive = self.simulator.is_alive()
         last = self.simulator.last_tick_time()
-        age = time.time() - last if last else -1
+        # The sim thread stamps ticks with perf_counter, the GUI's clock
+        age = now - last if last else -1
         queue_size = self.simulator.queue_size()
         
         print(f"[WATCHDOG] sim_alive={alive} last_tick_age={age:0.2f}s queue_size={queue_size}")
         
-        # Update camera with drone states for locking
-        self.camera.set_drone_states(self.drone_states)
-        
     def handle_events(self):
         """Handle pygame events."""
+        handlers = self._event_handlers
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-                
-            elif event.type == pygame.KEYDOWN:
-                key_name = pygame.key.name(event.key)
-                self.keys_pressed[key_name] = True
-                
-                # Check for Shift modifier
-                shift_pressed = bool(event.mod & pygame.KMOD_SHIFT)
-                self.handle_key_press(key_name, shift_pressed)
-                
-            elif event.type == pygame.KEYUP:
-                self.keys_pressed[pygame.key.name(event.key)] = False
-                
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # Left mouse button
-                    self.mouse_dragging = True
-                    self.last_mouse_pos = pygame.mouse.get_pos()
-                    
-            elif event.type == pygame.MOUSEBUTTONUP:
-                if event.button == 1:
-                    self.mouse_dragging = False
-                    
-            elif event.type == pygame.MOUSEMOTION:
-                if self.fpv_mode:
-                    # In FPV: mouse X controls yaw
-                    dx = event.rel[0]
-                    self.fpv_yaw_accumulator -= dx * 0.003
-                elif self.mouse_dragging:
-                    current_pos = pygame.mouse.get_pos()
-                    dx = current_pos[0] - self.last_mouse_pos[0]
-                    dy = current_pos[1] - self.last_mouse_pos[1]
-                    self.camera.handle_mouse_motion(dx, dy, True)
-                    self.last_mouse_pos = current_pos
-                    
-            elif event.type == pygame.MOUSEWHEEL:
-                self.camera.handle_scroll(event.y)
-                
-            elif event.type == pygame.VIDEORESIZE:
-                self.width = event.w
-                self.height = event.h
-                self.renderer.resize(self.width, self.height)
-                self.overlay.resize(self.width, self.height)
-                
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 3:  # Right mouse button
-                    # Future: implement drone selection
-                    pass
+            handler = handlers.get(event.type)
+            if handler is not None:
+                handler(event)
+                self._scene_dirty = True
+
+    def _build_event_handlers(self):
+        """Event type -> handler(event); types not listed are ignored."""
+        return {
+            pygame.QUIT: self._on_quit,
+            pygame.KEYDOWN: self._on_keydown,
+            pygame.MOUSEBUTTONDOWN: self._on_mouse_button_down,
+            pygame.MOUSEBUTTONUP: self._on_mouse_button_up,
+            pygame.MOUSEMOTION: self._on_mouse_motion,
+            pygame.MOUSEWHEEL: self._on_mouse_wheel,
+            pygame.VIDEORESIZE: self._on_resize,
+            pygame.VIDEOEXPOSE: self._on_expose,
+            pygame.WINDOWMINIMIZED: self._on_window_hidden,
+            pygame.WINDOWHIDDEN: self._on_window_hidden,
+            pygame.WINDOWRESTORED: self._on_window_shown,
+            pygame.WINDOWSHOWN: self._on_window_shown,
+            pygame.JOYDEVICEADDED: self._on_joy_device,
+            pygame.JOYDEVICEREMOVED: self._on_joy_device,
+        }
+
+    def _on_quit(self, event):
+        self.running = False
+
+    def _on_keydown(self, event):
+        # Check for Shift modifier
+        shift_pressed = bool(event.mod & pygame.KMOD_SHIFT)
+        self.handle_key_press(event.key, shift_pressed)
+
+    def _on_mouse_button_down(self, event):
+        if event.button == 1:  # Left mouse button
+            self.mouse_dragging = True
+            self.last_mouse_pos = event.pos
+        elif event.button == 3:  # Right mouse button
+            # Future: implement drone selection
+            pass
+
+    def _on_mouse_button_up(self, event):
+        if event.button == 1:
+            self.mouse_dragging = False
+
+    def _on_mouse_motion(self, event):
+        if self.fpv_mode:
+            # In FPV: mouse X controls yaw
+            dx = event.rel[0]
+            self.fpv_yaw_accumulator -= dx * 0.003
+        elif self.mouse_dragging:
+            # Deltas telescope: the frame's sum is last pos - first pos.
+            # event.pos is where this event happened, with no SDL call
+            x, y = event.pos
+            last_x, last_y = self.last_mouse_pos
+            self._mouse_dx += x - last_x
+            self._mouse_dy += y - last_y
+            self.last_mouse_pos = event.pos
+
+    def _on_mouse_wheel(self, event):
+        self.camera.handle_scroll(event.y)
+
+    def _on_resize(self, event):
+        self.width = event.w
+        self.height = event.h
+        self.renderer.resize(self.width, self.height)
+        self.overlay.resize(self.width, self.height)
+
+    def _on_expose(self, event):
+        # Nothing to do: handle_events marks the scene dirty, so the
+        # uncovered window is redrawn even while paused
+        pass
+
+    def _on_window_hidden(self, event):
+        self._window_visible = False
+
+    def _on_window_shown(self, event):
+        self._window_visible = True
+
+    def _on_joy_device(self, event):
+        self.gamepad.check_hotplug(self._last_frame_time, force=True)
 
-            elif event.type in (pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED):
-                self.gamepad.check_hotplug(time.time(), force=True)
-                
     def handle_key_press(self, key, shift_pressed=False):
-        """Handle specific key presses."""
-        if key == 'v':
+        """Handle a key press by pygame keycode."""
+        self._scene_dirty = True
+        if key == pygame.K_v:
             self._toggle_fpv()
             return
         # J key: toggle placement mode
-        if key == 'j' and not self.fpv_mode:
+        if key == pygame.K_j and not self.fpv_mode:
             if shift_pressed and self.placement_mode:
                 # Shift+J: toggle delete sub-mode
                 self.placement_delete_mode = not self.placement_delete_mode
@@ -247,125 +421,137 @@ class DroneSwarmGUI:
             return
 
         # In placement mode, handle placement-specific keys (but let H through for help)
-        if self.placement_mode and key != 'h':
+        if self.placement_mode and key != pygame.K_h:
             self._handle_placement_key(key, shift_pressed)
             return
 
         # In FPV mode, only process ESC (other keys used for flight control)
-        if self.fpv_mode and key != 'escape':
+        if self.fpv_mode and key != pygame.K_ESCAPE:
             return
-        if key == 'escape':
+        if key == pygame.K_ESCAPE:
             if self.fpv_mode:
                 self._exit_fpv()
                 return
-            print("\n[EXIT] User requested exit, shutting down...")
-            self.running = False
+            self._request_exit()
             return
-        if key == 'q' and not self.fpv_mode:
-            print("\n[EXIT] User requested exit, shutting down...")
-            self.running = False
-        elif key == 'p':  # P for pause (instead of space)
-            self.paused = not self.paused
-            if self.paused:
-                self.simulator.pause()
-            else:
-                self.simulator.resume()
-        elif key == 'o':  # O for step simulation
-            if self.paused:
-                self.simulator.step_simulation()
-        elif key == 'h':  # H for help
-            self.show_help = not self.show_help
-        elif key == 'f9':  # F9 for thread diagnostics
-            print("===== THREAD DIAGNOSTICS (F9) =====")
-            print(f"Simulator alive: {self.simulator.is_alive()}")
-            last = self.simulator.last_tick_time()
-            age = time.time() - last if last else -1
-            print(f"Last tick age: {age:0.2f}s")
-            print(f"Queue size: {self.simulator.queue_size()}")
-            print(f"Drones: {len(self.drone_states)}")
-            print("=====================================")
-        elif key == 'r':
-            # Reset camera
-            smooth_camera = self.gui_config.get('smooth_camera', True)
-            smoothing_factor = self.gui_config.get('camera_smoothing', 0.1)
-            self.camera = Camera([15, 15, 15], [0, 5, 0], smooth_camera, smoothing_factor)
-        elif key == 'home':
-            # Frame swarm - center camera on all drones
-            self.frame_swarm()
-        elif key == 't':
-            self.show_targets = not self.show_targets
-        elif key == 'g':
-            self.show_grid = not self.show_grid
-        elif key == 'x':
-            self.show_axes = not self.show_axes
-        elif key == 'c':
-            self.show_connections = not self.show_connections
-        elif key == 'l':  # L for labels
-            self.show_labels = not self.show_labels
-        elif key == 'f':  # F for formation lines
-            self.show_connections = not self.show_connections
-        elif key == '1':
-            if shift_pressed:
-                print("[GUI] Enqueue RESPAWN line")
-                self.simulator.respawn_formation('line')
-            else:
-                self.simulator.set_formation('line')
-        elif key == '2':
-            if shift_pressed:
-                print("Shift+2 pressed - requesting circle formation spawn")
-                self.simulator.respawn_formation('circle')
-            else:
-                self.simulator.set_formation('circle')
-        elif key == '3':
-            if shift_pressed:
-                print("Shift+3 pressed - requesting grid formation spawn")
-                self.simulator.respawn_formation('grid')
-            else:
-                self.simulator.set_formation('grid')
-        elif key == '4':
-            if shift_pressed:
-                print("Shift+4 pressed - requesting v formation spawn")
-                self.simulator.respawn_formation('v')
-            else:
-                self.simulator.set_formation('v_formation')
-        elif key == '5':
-            if shift_pressed:
-                print("Shift+5 pressed - requesting random formation spawn")
-                self.simulator.respawn_formation('random')
-        elif key == '0':
-            self.simulator.set_formation('idle')
-        # Drone locking (6-9 keys for drone IDs, avoiding conflict with formation keys)
-        elif key in '6789':
-            drone_id = int(key) - 1
-            if drone_id < len(self.drone_states):
-                if self.camera.locked_drone_id == drone_id:
-                    self.camera.unlock_camera()
-                else:
-                    self.camera.lock_to_drone(drone_id)
-        # Obstacle controls
-        elif key == 'b':
-            self.obstacle_type = 'cylinder' if self.obstacle_type == 'box' else 'box'
-            print(f"[GUI] Obstacle type: {self.obstacle_type}")
-        elif key == 'n':
-            target = list(self.camera.target)
-            if self.obstacle_type == 'box':
-                self.simulator.add_box_obstacle(target, [4.0, 4.0, 4.0])
-                print(f"[GUI] Placed box at {target}")
-            else:
-                self.simulator.add_cylinder_obstacle(target, 2.0, 8.0)
-                print(f"[GUI] Placed cylinder at {target}")
-        elif key == 'm':
-            if shift_pressed:
-                self.simulator.clear_all_obstacles()
-                print("[GUI] Cleared all obstacles")
+        action = self._key_actions.get(key)
+        if action is not None:
+            action(shift_pressed)
+
+    def _build_key_actions(self):
+        """Keycode -> handler(shift_pressed) for the normal-mode keys."""
+        def toggle(attr):
+            return partial(self._toggle_flag, attr)
+
+        toggle_connections = toggle('show_connections')  # C and F
+        actions = {
+            pygame.K_q: lambda shift: self._request_exit(),
+            pygame.K_p: lambda shift: self._toggle_pause(),
+            pygame.K_o: lambda shift: self._step_if_paused(),
+            pygame.K_h: toggle('show_help'),
+            pygame.K_F9: lambda shift: self._print_thread_diagnostics(),
+            pygame.K_r: lambda shift: self.camera.reset([15, 15, 15], [0, 5, 0]),
+            pygame.K_HOME: lambda shift: self.frame_swarm(),
+            pygame.K_t: toggle('show_targets'),
+            pygame.K_g: toggle('show_grid'),
+            pygame.K_x: toggle('show_axes'),
+            pygame.K_c: toggle_connections,
+            pygame.K_f: toggle_connections,
+            pygame.K_l: toggle('show_labels'),
+            pygame.K_k: toggle('show_obstacles'),
+            pygame.K_0: lambda shift: self.simulator.set_formation('idle'),
+            pygame.K_b: lambda shift: self._cycle_obstacle_type(),
+            pygame.K_n: lambda shift: self._place_obstacle_at_target(),
+            pygame.K_m: self._remove_obstacles,
+        }
+        # 1-5: formation (Shift: respawn in that preset)
+        for key, (formation, preset) in _FORMATION_KEYS.items():
+            actions[key] = partial(self._formation_key, formation, preset)
+        # 6-9: toggle camera lock on drone IDs 5-8 (1-5 are formation keys)
+        for drone_id, key in enumerate(_DRONE_LOCK_KEYS, 5):
+            actions[key] = partial(self._toggle_drone_lock, drone_id)
+        return actions
+
+
+    def _toggle_flag(self, attr, shift_pressed=False):
+        """Flip a boolean display setting."""
+        setattr(self, attr, not getattr(self, attr))
+
+    def _request_exit(self):
+        """Stop the main loop (ESC/Q)."""
+        print("\n[EXIT] User requested exit, shutting down...")
+        self.running = False
+
+    def _toggle_pause(self):
+        """Pause or resume the simulation (P)."""
+        self.paused = not self.paused
+        if self.paused:
+            self.simulator.pause()
+        else:
+            self.simulator.resume()
+
+    def _step_if_paused(self):
+        """Advance one simulation tick while paused (O)."""
+        if self.paused:
+            self.simulator.step_simulation()
+
+    def _print_thread_diagnostics(self):
+        """Print simulator thread health (F9)."""
+        print("===== THREAD DIAGNOSTICS (F9) =====")
+        print(f"Simulator alive: {self.simulator.is_alive()}")
+        last = self.simulator.last_tick_time()
+        age = time.perf_counter() - last if last else -1
+        print(f"Last tick age: {age:0.2f}s")
+        print(f"Queue size: {self.simulator.queue_size()}")
+        print(f"Drones: {len(self.drone_states)}")
+        print("=====================================")
+
+    def _formation_key(self, formation, preset, shift_pressed):
+        """Fly a formation, or respawn in a preset with Shift (1-5)."""
+        if shift_pressed:
+            print(f"[GUI] Enqueue RESPAWN {preset}")
+            self.simulator.respawn_formation(preset)
+        elif formation is not None:
+            self.simulator.set_formation(formation)
+
+    def _toggle_drone_lock(self, drone_id, shift_pressed=False):
+        """Lock the camera to a drone, or unlock if already locked (6-9)."""
+        if drone_id < len(self.drone_states):
+            if self.camera.locked_drone_id == drone_id:
+                self.camera.unlock_camera()
             else:
-                self.simulator.remove_last_obstacle()
-                print("[GUI] Removed last obstacle")
-        elif key == 'k':
-            self.show_obstacles = not self.show_obstacles
+                self.camera.lock_to_drone(drone_id)
+
+    def _cycle_obstacle_type(self):
+        """Switch the N-key obstacle between box and cylinder (B)."""
+        self.obstacle_type = 'cylinder' if self.obstacle_type == 'box' else 'box'
+        print(f"[GUI] Obstacle type: {self.obstacle_type}")
+
+    def _place_obstacle_at_target(self):
+        """Drop an obstacle at the camera target (N)."""
+        target = list(self.camera.target)
+        if self.obstacle_type == 'box':
+            self.simulator.add_box_obstacle(target, [4.0, 4.0, 4.0])
+            print(f"[GUI] Placed box at {target}")
+        else:
+            self.simulator.add_cylinder_obstacle(target, 2.0, 8.0)
+            print(f"[GUI] Placed cylinder at {target}")
+
+    def _remove_obstacles(self, shift_pressed):
+        """Remove the last obstacle, or all of them with Shift (M)."""
+        if shift_pressed:
+            self.simulator.clear_all_obstacles()
+            print("[GUI] Cleared all obstacles")
+        else:
+            self.simulator.remove_last_obstacle()
+            print("[GUI] Removed last obstacle")
             
     def render(self):
         """Render the 3D scene."""
+        # The snapshot update() prepared (and extrapolated) for this frame
+        drone_states = self._frame_states
+        formation = self._current_formation
+
         # Clear screen
         self.renderer.clear()
 
@@ -373,7 +559,6 @@ class DroneSwarmGUI:
         if self.fpv_mode:
             drone_state = self._get_fpv_drone_state()
             if drone_state:
-                from gui.camera import Camera
                 Camera.apply_fpv_view(drone_state)
             else:
                 self.camera.apply_view_matrix()
@@ -381,7 +566,7 @@ class DroneSwarmGUI:
             self.camera.apply_view_matrix()
         
         # Batch render unlit elements (grid, axes, connections, targets)
-        if hasattr(self.renderer, 'begin_unlit_section'):
+        if self._batched_renderer:
             # Using optimized renderer with batched state changes
             self.renderer.begin_unlit_section()
             
@@ -392,21 +577,18 @@ class DroneSwarmGUI:
                 self.renderer.draw_axes()
                 
             # Draw formation connections
-            if self.show_connections and self.sim_info.get('current_formation') != 'idle':
-                self.renderer.draw_formation_connections(
-                    self.drone_states, 
-                    self.sim_info.get('current_formation', '')
-                )
+            if self.show_connections and formation != 'idle':
+                self.renderer.draw_formation_connections(drone_states, formation)
                 
             # Draw all targets
             if self.show_targets:
-                self.renderer.draw_all_targets(self.drone_states)
+                self.renderer.draw_all_targets(drone_states)
                 
             self.renderer.end_unlit_section()
             
             # Draw all drones with lighting enabled (batched)
-            if self.drone_states:
-                self.renderer.draw_all_drones(self.drone_states, self.config['drones']['size'], self.camera.locked_drone_id)
+            if drone_states:
+                self.renderer.draw_all_drones(drone_states, self.drone_size, self.camera.locked_drone_id)
 
             # Draw obstacles (lit) with optional highlight
             if self.show_obstacles and self.obstacle_states:
@@ -423,12 +605,14 @@ class DroneSwarmGUI:
                     self.placement_cursor, self.placement_type, cursor_size)
 
             # Draw all labels (batched, no depth test)
-            if self.show_labels and self.drone_states:
+            if self.show_labels and drone_states:
                 self.renderer.begin_unlit_section()
-                self.renderer.draw_all_labels(self.drone_states, self.camera.position)
+                self.renderer.draw_all_labels(drone_states, self.camera.position)
                 self.renderer.end_unlit_section()
         else:
-            # Fallback to original renderer
+            # Fallback to original renderer (draws from per-drone dicts)
+            drone_states = drone_states.to_dicts()
+
             # Draw grid and axes
             if self.show_grid:
                 self.renderer.draw_grid()
@@ -436,29 +620,29 @@ class DroneSwarmGUI:
                 self.renderer.draw_axes()
                 
             # Draw formation connections
-            if self.show_connections and self.sim_info.get('current_formation') != 'idle':
-                self.renderer.draw_formation_connections(
-                    self.drone_states, 
-                    self.sim_info.get('current_formation', '')
-                )
+            if self.show_connections and formation != 'idle':
+                self.renderer.draw_formation_connections(drone_states, formation)
                 
             # Draw drones (batched quad-prop model)
-            if self.drone_states:
-                self.renderer.draw_all_drones(self.drone_states, self.config['drones']['size'], self.camera.locked_drone_id)
+            if drone_states:
+                self.renderer.draw_all_drones(drone_states, self.drone_size, self.camera.locked_drone_id)
 
             # Draw targets
-            for drone_state in self.drone_states:
-                if self.show_targets:
+            show_targets = self.show_targets
+            show_labels = self.show_labels
+            camera_pos = self.camera.position
+            for drone_state in drone_states:
+                if show_targets:
                     target = drone_state['target']
                     color = drone_state['color']
                     self.renderer.draw_target(target, color)
 
                 # Draw drone labels
-                if self.show_labels:
+                if show_labels:
                     position = drone_state['position']
                     drone_id = drone_state['id']
                     color = drone_state['color']
-                    self.renderer.draw_drone_label(position, drone_id, color, self.camera.position)
+                    self.renderer.draw_drone_label(position, drone_id, color, camera_pos)
 
             # Draw obstacles (fallback renderer)
             if self.show_obstacles and self.obstacle_states:
@@ -474,31 +658,129 @@ class DroneSwarmGUI:
                 self.renderer.draw_placement_cursor(
                     self.placement_cursor, self.placement_type, cursor_size)
 
-        # Draw overlays with error handling
+        # Blit the HUD composed after the previous swap
         if self.enable_overlay:
             try:
-                self.draw_overlays()
+                self.overlay.render_to_screen()
             except Exception as e:
                 print(f"[OVERLAY-OFF] HUD crashed, disabling overlay: {e}")
                 self.enable_overlay = False
                 
-        # Swap buffers
+        # Swap buffers. This stays on the main thread: the GL context is
+        # current only on the thread that created the window, and SDL
+        # requires window calls from the main thread on macOS and Windows.
+        # The sim already runs on its own thread, so the CPU work that can
+        # overlap the swap is the HUD composition below
         pygame.display.flip()
+
+        # Compose the next HUD right after the swap: it is CPU-only (text
+        # layout and pixel readback), so it overlaps the driver's swap
+        # instead of queueing GL calls behind it
+        # A changed HUD is only blitted by the next render, so keep the
+        # scene dirty for it (a paused scene would otherwise stay stale)
+        if self.enable_overlay:
+            try:
+                if self.compose_overlays():
+                    self._scene_dirty = True
+            except Exception as e:
+                print(f"[OVERLAY-OFF] HUD crashed, disabling overlay: {e}")
+                self.enable_overlay = False
         
+    def _pace_frame(self):
+        """Wait for the next frame slot and record the frame time.
+
+        Called at the top of the loop, so input is read after the wait
+        rather than before it (the sleep no longer adds to input latency).
+        Sleeps until just short of the deadline, then spins the rest: OS
+        sleep granularity alone (up to ~15ms on Windows) would overshoot
+        a 16.7ms frame. Skipped when vsync paces the loop through the
+        buffer swap.
+        """
+        now = time.perf_counter()
+        if self.max_fps > 0 and not self._swap_paced:
+            deadline = self._next_frame_time
+            if deadline - now > _SPIN_MARGIN:
+                time.sleep(deadline - now - _SPIN_MARGIN)
+            while time.perf_counter() < deadline:
+                pass
+            now = time.perf_counter()
+            # Schedule from the deadline to avoid drift; resync if we fell
+            # more than a frame behind instead of bursting to catch up
+            self._next_frame_time = max(deadline + 1.0 / self.max_fps, now)
+        self.frame_dt = now - self._last_frame_time
+        self._last_frame_time = now
+
+    def _extrapolate(self, drone_states):
+        """Advance a snapshot to the frame time at constant velocity.
+
+        Snapshots arrive at the sim tick rate; drawing p + v * age instead
+        of p keeps motion smooth when the GUI renders faster than that.
+        The age is capped at _max_extrapolation so a stalled sim thread
+        cannot fling drones off, and a paused sim is drawn as-is.
+        """
+        if not drone_states or self._sim_paused:
+            return drone_states
+        age = min(self._last_frame_time - self._state_time, self._max_extrapolation)
+        if age <= 0:
+            return drone_states
+        positions = drone_states.positions + drone_states.velocities * age
+        return replace(drone_states, positions=positions)
+
+    def _needs_redraw(self):
+        """Whether this frame can differ from the one on screen.
+
+        Only a paused scene is ever skipped, and only when no state push,
+        input event, key action or HUD change arrived and the camera did
+        not move since the last drawn frame. FPV and placement modes always redraw.
+        """
+        view = (*self.camera.position.tolist(), *self.camera.target.tolist())
+        redraw = (self._scene_dirty or not self.paused or self.fpv_mode
+                  or self.placement_mode or view != self._drawn_view)
+        self._scene_dirty = False
+        self._drawn_view = view
+        return redraw
+
+    def _events_due(self):
+        """Whether to pump SDL events this frame.
+
+        A capped or vsynced loop already runs once per frame slot, so it
+        pumps every frame. Otherwise (max_fps: 0) it can spin thousands of times a
+        second; pumping is then limited to gui.event_poll_rate.
+        """
+        if self.max_fps > 0 or self._swap_paced:
+            return True
+        now = self._last_frame_time
+        if now < self._next_event_pump:
+            return False
+        self._next_event_pump = max(self._next_event_pump + self._event_period, now)
+        return True
+
     def update(self):
         """Update the GUI state."""
-        dt = self.clock.tick(60) / 1000.0  # Convert to seconds
+        dt = self.frame_dt
+        current_time = self._last_frame_time
+        self.keys_pressed = pygame.key.get_pressed()
+        self._apply_pending_snapshot()
+        frame_states = self.drone_states
+        if self.extrapolate_states:
+            frame_states = self._extrapolate(frame_states)
+        if frame_states is not self._frame_states:
+            self._frame_states = frame_states
+            self.camera.set_drone_states(frame_states)
         
-        # Update FPS counter
-        self.frame_count += 1
-        current_time = time.time()
-        if current_time - self.last_fps_update >= 1.0:  # Update every second
-            self.fps = self.frame_count / (current_time - self.last_fps_update)
-            self.frame_count = 0
-            self.last_fps_update = current_time
+        # Update FPS counter. Averaging dt (not 1/dt) keeps a single long
+        # frame from spiking the readout
+        self._avg_frame_dt += 0.1 * (dt - self._avg_frame_dt)
+        if self._avg_frame_dt > 0:
+            self.fps = 1.0 / self._avg_frame_dt
         
         # Poll gamepad
-        self.gamepad.poll(time.time())
+        self.gamepad.poll(current_time)
+
+        # Orbit drag: one camera update per frame, however many motion events
+        if self._mouse_dx or self._mouse_dy:
+            self.camera.handle_mouse_motion(self._mouse_dx, self._mouse_dy, True)
+            self._mouse_dx = self._mouse_dy = 0
 
         # FPV mode: send velocity commands based on keyboard + gamepad input
         if self.fpv_mode:
@@ -518,7 +800,6 @@ class DroneSwarmGUI:
                     self._update_gamepad_normal(dt)
         
         # Diagnostic logging every N seconds
-        current_time = time.time()
         if current_time - self.last_diagnostic_log >= self.diagnostic_interval:
             self.last_diagnostic_log = current_time
             self._log_diagnostics()
@@ -526,7 +807,7 @@ class DroneSwarmGUI:
                         
     def _log_diagnostics(self):
         """Log diagnostic information for debugging."""
-        print(f"[DIAGNOSTIC] Time: {time.time() - self.start_time:.1f}s | "
+        print(f"[DIAGNOSTIC] Time: {self._last_frame_time - self.start_time:.1f}s | "
               f"FPS: {self.fps:.1f} | "
               f"Drones: {len(self.drone_states)} | "
               f"Camera: ({self.camera.position[0]:.1f}, {self.camera.position[1]:.1f}, {self.camera.position[2]:.1f}) | "
@@ -547,65 +828,50 @@ class DroneSwarmGUI:
             print("No drones to frame")
             return
             
-        # Import coordinate utilities
-        from simulation.coords import get_bounding_box, calculate_camera_distance
-        
-        # Get drone positions
-        positions = [state['position'] for state in self.drone_states]
-        
-        # Calculate bounding box and centroid
-        min_pos, max_pos, centroid = get_bounding_box(positions)
+        # Calculate bounding box and centroid straight from the (N, 3) array
+        min_pos, max_pos, centroid = get_bounding_box(self.drone_states.positions)
         distance = calculate_camera_distance(min_pos, max_pos, 20.0)
         
         print(f"Framing swarm: centroid={centroid}, distance={distance:.1f}")
         
-        # Update camera to look at centroid from appropriate distance
-        # Position camera at distance from centroid
-        cam_offset = [distance * 0.6, distance * 0.6, distance * 0.6]
-        new_camera_pos = [
-            centroid[0] + cam_offset[0],
-            centroid[1] + cam_offset[1], 
-            centroid[2] + cam_offset[2]
-        ]
-        
-        # Update camera position and target
-        smooth_camera = self.gui_config.get('smooth_camera', True)
-        smoothing_factor = self.gui_config.get('camera_smoothing', 0.1)
-        self.camera = Camera(new_camera_pos, centroid, smooth_camera, smoothing_factor)
+        # Position camera at distance from centroid (Camera.reset copies it,
+        # so the scratch vector can be reused)
+        new_camera_pos = np.add(centroid, distance * 0.6, out=self._frame_scratch)
+        self.camera.reset(new_camera_pos, centroid)
         
     def _handle_placement_key(self, key, shift_pressed):
-        """Handle keys while in placement mode."""
+        """Handle keys (pygame keycodes) while in placement mode."""
         speed = self.placement_cursor_speed
 
         if self.placement_delete_mode:
             # Delete sub-mode: scroll and remove
-            if key == 'right' and self.obstacle_states:
+            if key == pygame.K_RIGHT and self.obstacle_states:
                 self.placement_selected_idx = (self.placement_selected_idx + 1) % len(self.obstacle_states)
-            elif key == 'left' and self.obstacle_states:
+            elif key == pygame.K_LEFT and self.obstacle_states:
                 self.placement_selected_idx = (self.placement_selected_idx - 1) % len(self.obstacle_states)
-            elif key in ('delete', 'backspace') and 0 <= self.placement_selected_idx < len(self.obstacle_states):
+            elif key in (pygame.K_DELETE, pygame.K_BACKSPACE) and 0 <= self.placement_selected_idx < len(self.obstacle_states):
                 print(f"[PLACEMENT] Removing obstacle {self.placement_selected_idx}")
                 self.simulator.remove_obstacle_by_index(self.placement_selected_idx)
                 if self.placement_selected_idx >= len(self.obstacle_states) - 1:
                     self.placement_selected_idx = max(0, len(self.obstacle_states) - 2)
-            elif key == 'escape':
+            elif key == pygame.K_ESCAPE:
                 self.placement_delete_mode = False
                 self.placement_selected_idx = -1
             return
 
         # Normal placement mode (cursor[0]=X, cursor[1]=Z)
-        if key == 'up':
+        if key == pygame.K_UP:
             self.placement_cursor[1] += speed  # +Z = away from default camera
-        elif key == 'down':
+        elif key == pygame.K_DOWN:
             self.placement_cursor[1] -= speed
-        elif key == 'left':
+        elif key == pygame.K_LEFT:
             self.placement_cursor[0] += speed
-        elif key == 'right':
+        elif key == pygame.K_RIGHT:
             self.placement_cursor[0] -= speed
-        elif key == 'b':
+        elif key == pygame.K_b:
             self.placement_type = 'cylinder' if self.placement_type == 'box' else 'box'
             print(f"[PLACEMENT] Type: {self.placement_type}")
-        elif key == 'return':
+        elif key == pygame.K_RETURN:
             cx, cz = self.placement_cursor
             if self.placement_type == 'box':
                 sz = self.placement_box_size
@@ -617,7 +883,7 @@ class DroneSwarmGUI:
                 pos = [cx, 0.0, cz]  # base on ground
                 self.simulator.add_cylinder_obstacle(pos, r, h)
                 print(f"[PLACEMENT] Placed cylinder at ({cx:.1f}, {cz:.1f})")
-        elif key in ('=', 'plus', ']'):  # increase size
+        elif key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS, pygame.K_RIGHTBRACKET):  # increase size
             if self.placement_type == 'box':
                 self.placement_box_size = [s + 1.0 for s in self.placement_box_size]
                 print(f"[PLACEMENT] Box size: {self.placement_box_size}")
@@ -625,7 +891,7 @@ class DroneSwarmGUI:
                 self.placement_cyl_size[0] += 0.5
                 self.placement_cyl_size[1] += 2.0
                 print(f"[PLACEMENT] Cylinder: r={self.placement_cyl_size[0]:.1f} h={self.placement_cyl_size[1]:.1f}")
-        elif key in ('-', 'minus', '['):  # decrease size
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS, pygame.K_LEFTBRACKET):  # decrease size
             if self.placement_type == 'box':
                 self.placement_box_size = [max(1.0, s - 1.0) for s in self.placement_box_size]
                 print(f"[PLACEMENT] Box size: {self.placement_box_size}")
@@ -633,7 +899,7 @@ class DroneSwarmGUI:
                 self.placement_cyl_size[0] = max(0.5, self.placement_cyl_size[0] - 0.5)
                 self.placement_cyl_size[1] = max(2.0, self.placement_cyl_size[1] - 2.0)
                 print(f"[PLACEMENT] Cylinder: r={self.placement_cyl_size[0]:.1f} h={self.placement_cyl_size[1]:.1f}")
-        elif key == 'escape':
+        elif key == pygame.K_ESCAPE:
             self.placement_mode = False
             self.placement_delete_mode = False
             print("[PLACEMENT] Placement mode OFF")
@@ -651,7 +917,7 @@ class DroneSwarmGUI:
 
         drone_id = self.camera.locked_drone_id
         # Verify drone exists
-        drone_state = next((d for d in self.drone_states if d['id'] == drone_id), None)
+        drone_state = self._get_drone_state(drone_id)
         if drone_state is None:
             print(f"[FPV] Drone {drone_id} not found")
             return
@@ -676,7 +942,6 @@ class DroneSwarmGUI:
 
     def _update_fpv_input(self):
         """Process keyboard input and send velocity commands in FPV mode."""
-        import math
         drone_state = self._get_fpv_drone_state()
         if drone_state is None:
             self._exit_fpv()
@@ -690,17 +955,18 @@ class DroneSwarmGUI:
         strafe = 0.0
         vertical = 0.0
 
-        if self.keys_pressed.get('w', False):
+        keys = self.keys_pressed
+        if keys[pygame.K_w]:
             forward += 1.0
-        if self.keys_pressed.get('s', False):
+        if keys[pygame.K_s]:
             forward -= 1.0
-        if self.keys_pressed.get('d', False):
+        if keys[pygame.K_d]:
             strafe -= 1.0
-        if self.keys_pressed.get('a', False):
+        if keys[pygame.K_a]:
             strafe += 1.0
-        if self.keys_pressed.get('e', False):
+        if keys[pygame.K_e]:
             vertical += 1.0
-        if self.keys_pressed.get('q', False):
+        if keys[pygame.K_q]:
             vertical -= 1.0
 
         # Add gamepad contribution
@@ -709,7 +975,7 @@ class DroneSwarmGUI:
             forward += -gp.left_stick[1]   # stick Y inverted (up = -1)
             strafe += -gp.left_stick[0]
             vertical += gp.right_trigger - gp.left_trigger
-            dt = self.clock.get_time() / 1000.0 if self.clock.get_time() > 0 else 1/60
+            dt = self.frame_dt if self.frame_dt > 0 else 1/60
             self.fpv_yaw_accumulator -= gp.right_stick[0] * gp.fpv_yaw_sensitivity * self.fpv_yaw_rate * dt
 
         # Rotate velocity by yaw to get world-frame XZ
@@ -736,11 +1002,23 @@ class DroneSwarmGUI:
         """Get the current state of the FPV drone."""
         if self.fpv_drone_id is None:
             return None
-        return next((d for d in self.drone_states if d['id'] == self.fpv_drone_id), None)
+        return self._get_drone_state(self.fpv_drone_id)
+
+    def _get_drone_state(self, drone_id):
+        """Position/velocity/orientation dict for one drone of the frame's snapshot, or None."""
+        states = self._frame_states
+        idx = states.index_of(drone_id)
+        if idx is None:
+            return None
+        return {
+            'id': drone_id,
+            'position': states.positions[idx].tolist(),
+            'velocity': states.velocities[idx].tolist(),
+            'orientation': states.orientations[idx].tolist(),
+        }
 
     def _update_gamepad_normal(self, dt):
         """Process gamepad sticks/triggers for camera control in normal mode."""
-        import math
         gp = self.gamepad
 
         # Left stick -> camera pan (same vectors as WASD)
@@ -818,41 +1096,42 @@ class DroneSwarmGUI:
             # Placement-specific button actions
             if gp.buttons_pressed.get(GamepadManager.BTN_A):
                 if self.placement_delete_mode:
-                    self._handle_placement_key('delete', False)
+                    self._handle_placement_key(pygame.K_DELETE, False)
                 else:
-                    self._handle_placement_key('return', False)
+                    self._handle_placement_key(pygame.K_RETURN, False)
             if gp.buttons_pressed.get(GamepadManager.BTN_X):
-                self._handle_placement_key('b', False)
+                self._handle_placement_key(pygame.K_b, False)
             if gp.buttons_pressed.get(GamepadManager.BTN_Y):
                 # Toggle delete sub-mode
-                self.handle_key_press('j', True)
+                self.handle_key_press(pygame.K_j, True)
             if gp.buttons_pressed.get(GamepadManager.BTN_RB):
-                self._handle_placement_key('=', False)
+                self._handle_placement_key(pygame.K_EQUALS, False)
             if gp.buttons_pressed.get(GamepadManager.BTN_LB):
-                self._handle_placement_key('-', False)
+                self._handle_placement_key(pygame.K_MINUS, False)
             # D-pad for obstacle selection in delete mode
             dx, dy = gp.dpad
             if self.placement_delete_mode:
-                if dx > 0 and hasattr(self, '_gp_dpad_prev_x') and self._gp_dpad_prev_x <= 0:
-                    self._handle_placement_key('right', False)
-                elif dx < 0 and hasattr(self, '_gp_dpad_prev_x') and self._gp_dpad_prev_x >= 0:
-                    self._handle_placement_key('left', False)
+                prev_x = self._gp_dpad_prev_x
+                if dx > 0 and prev_x is not None and prev_x <= 0:
+                    self._handle_placement_key(pygame.K_RIGHT, False)
+                elif dx < 0 and prev_x is not None and prev_x >= 0:
+                    self._handle_placement_key(pygame.K_LEFT, False)
             self._gp_dpad_prev_x = dx
             return
 
         # Normal mode button actions
         if gp.buttons_pressed.get(GamepadManager.BTN_A):
-            self.handle_key_press('p', False)  # pause
+            self.handle_key_press(pygame.K_p, False)  # pause
         if gp.buttons_pressed.get(GamepadManager.BTN_X):
-            self.handle_key_press('h', False)  # help
+            self.handle_key_press(pygame.K_h, False)  # help
         if gp.buttons_pressed.get(GamepadManager.BTN_Y):
-            self.handle_key_press('home', False)  # frame swarm
+            self.handle_key_press(pygame.K_HOME, False)  # frame swarm
         if gp.buttons_pressed.get(GamepadManager.BTN_BACK):
-            self.handle_key_press('l', False)  # labels
+            self.handle_key_press(pygame.K_l, False)  # labels
         if gp.buttons_pressed.get(GamepadManager.BTN_L3):
-            self.handle_key_press('r', False)  # reset camera
+            self.handle_key_press(pygame.K_r, False)  # reset camera
         if gp.buttons_pressed.get(GamepadManager.BTN_R3):
-            self.handle_key_press('g', False)  # grid
+            self.handle_key_press(pygame.K_g, False)  # grid
 
         # LB/RB -> cycle drone lock
         if gp.buttons_pressed.get(GamepadManager.BTN_RB):
@@ -862,8 +1141,6 @@ class DroneSwarmGUI:
 
         # D-pad left/right -> cycle formations
         dx, dy = gp.dpad
-        if not hasattr(self, '_gp_dpad_prev'):
-            self._gp_dpad_prev = (0, 0)
         if dx > 0 and self._gp_dpad_prev[0] <= 0:
             self._formation_cycle_index = (self._formation_cycle_index + 1) % len(self._formation_list)
             formation = self._formation_list[self._formation_cycle_index]
@@ -891,36 +1168,40 @@ class DroneSwarmGUI:
                 return
         self.camera.lock_to_drone(new_id)
 
-    def draw_overlays(self):
-        """Draw all GUI overlays."""
+    def compose_overlays(self):
+        """Lay out all GUI overlays into the overlay's pixel buffer (no GL calls).
+
+        Returns True when the HUD differs from the one last composed.
+        """
         self.overlay.clear()
         
         # Draw FPS counter
         if self.show_fps:
-            self.overlay.draw_fps(self.fps)
+            if self._last_frame_time - self._hud_fps_time >= _HUD_FPS_PERIOD:
+                self._hud_fps = self.fps
+                self._hud_fps_time = self._last_frame_time
+            self.overlay.draw_fps(self._hud_fps)
             
         # Draw simulation time
         if self.show_sim_time:
-            elapsed = time.time() - self.start_time
+            elapsed = self._last_frame_time - self.start_time
             self.overlay.draw_sim_time(elapsed)
             
         # Draw formation type and spawn preset
         if self.show_formation_type:
             formation = self.sim_info.get('current_formation', 'idle')
-            spawn_preset = self.sim_info.get('spawn_preset', 'unknown')
             self.overlay.draw_formation_type(formation)
-            self.overlay.draw_text(f"Spawn: {spawn_preset}", 10, 90, self.overlay.color)
+            self.overlay.draw_text(self._spawn_label, 10, 90, self.overlay.color)
             
         # Draw drone count and status
         if self.drone_states:
-            settled_count = sum(1 for drone in self.drone_states if drone['settled'])
-            self.overlay.draw_drone_count(len(self.drone_states), settled_count)
+            self.overlay.draw_drone_count(len(self.drone_states), self._settled_count)
         else:
             # Show "No drones" if none exist
             self.overlay.draw_text("Drones: 0", 10, 110, self.overlay.color)
             
         # Draw up-axis info
-        self.overlay.draw_text(f"Up-axis: {self.up_axis.upper()}", 10, 130, self.overlay.color)
+        self.overlay.draw_text(self._up_axis_label, 10, 130, self.overlay.color)
             
         # Draw camera info if locked to drone
         if self.camera.locked_drone_id is not None:
@@ -934,8 +1215,7 @@ class DroneSwarmGUI:
         if self.fpv_mode:
             drone_state = self._get_fpv_drone_state()
             if drone_state:
-                import math
-                speed = sum(v**2 for v in drone_state['velocity'])**0.5
+                speed = math.hypot(*drone_state['velocity'])
                 alt = drone_state['position'][1]
                 yaw_deg = math.degrees(drone_state['orientation'][2])
                 self.overlay.draw_text(f"FPV - Drone {self.fpv_drone_id}", 10, 190, (0, 255, 0))
@@ -972,42 +1252,15 @@ class DroneSwarmGUI:
         if self.show_help:
             self.overlay.draw_help_overlay()
             
-        # Render overlay to screen
-        self.overlay.render_to_screen()
+        # Snapshot the pixels for the next render_to_screen()
+        return self.overlay.prepare()
         
     def run(self):
         """Main GUI loop."""
         print("[DEBUG] GUI run() method called")
         print("Starting Drone Swarm 3D GUI...")
         print("[DEBUG] About to print controls...")
-        print("Controls:")
-        print("  WASD/QE - Move camera")
-        print("  Mouse drag - Rotate camera")
-        print("  Mouse wheel - Zoom")
-        print("  1-4 - Formation patterns (Line, Circle, Grid, V)")
-        print("  5 - (unused)")
-        print("  0 - Idle formation")
-        print("  Shift+1-5 - Respawn in preset formations (Line, Circle, Grid, V, Random)")
-        print("  P - Pause/Resume")
-        print("  O - Step simulation (when paused)")
-        print("  H - Toggle help overlay")
-        print("  T - Toggle targets")
-        print("  G - Toggle grid")
-        print("  X - Toggle axes")
-        print("  C/F - Toggle formation connections")
-        print("  L - Toggle drone labels")
-        print("  R - Reset camera")
-        print("  Home - Frame swarm (center camera on all drones)")
-        print("  6-9 (hold) - Lock camera to drone")
-        print("  ESC/Q - Exit application")
-        print("")
-        print("GUI Enhancements:")
-        print("  - FPS counter and simulation time display")
-        print("  - Drone ID labels above each drone")
-        print("  - Enhanced formation visualization")
-        print("  - Smooth camera interpolation")
-        print("  - Interactive pause/step controls")
-        print("  - Comprehensive help overlay (press H)")
+        sys.stdout.write(_CONTROLS_TEXT)
         
         print("[DEBUG] Controls printed, about to start simulation...")
         
@@ -1016,15 +1269,29 @@ class DroneSwarmGUI:
         
         print("[DEBUG] About to enter main GUI loop...")
         
+        # Bind the per-frame methods once for the loop below
+        pace_frame, events_due = self._pace_frame, self._events_due
+        handle_events, watchdog_tick = self.handle_events, self._watchdog_tick
+        update, needs_redraw, render = self.update, self._needs_redraw, self.render
+        sleep = time.sleep
+
         try:
             while self.running:
-                self.handle_events()
+                pace_frame()
+                if events_due():
+                    handle_events()
                 
                 # Monitor simulation thread health
-                self._watchdog_tick()
+                watchdog_tick()
                 
-                self.update()  # Always update to maintain frame timing
-                self.render()
+                update()  # Always update to maintain frame timing
+                if not self._window_visible:
+                    sleep(_HIDDEN_FRAME_PERIOD)
+                elif needs_redraw():
+                    render()
+                elif self._swap_paced or self.max_fps <= 0:
+                    # No swap to block on: don't spin while idle
+                    sleep(_IDLE_FRAME_PERIOD)
                 
         finally:
             # Clean up
@@ -1,7 +1,63 @@
 import pygame
-import time
 from OpenGL.GL import *
 
+# Rendered text surfaces kept between frames; the cache is dropped when full
+_TEXT_CACHE_SIZE = 256
+
+# Controls reference shown by the H overlay (and printed at GUI startup)
+HELP_LINES = (
+    "DRONE SWARM SIMULATOR - CONTROLS",
+    "",
+    "Camera:",
+    "  WASD/QE - Move camera",
+    "  Mouse drag - Rotate camera",
+    "  Mouse wheel - Zoom",
+    "  R - Reset camera",
+    "  Home - Frame swarm (center on drones)",
+    "  6-9 - Lock camera to drone",
+    "",
+    "Formations:",
+    "  1 - Line    2 - Circle",
+    "  3 - Grid    4 - V-formation",
+    "  0 - Idle (no formation)",
+    "",
+    "Spawning:",
+    "  Shift+1-5 - Respawn in preset",
+    "  (Line, Circle, Grid, V, Random)",
+    "",
+    "Display:",
+    "  T - Targets   G - Grid",
+    "  X - Axes      L - Labels",
+    "  C/F - Formation connections",
+    "",
+    "FPV Mode:",
+    "  V - Toggle first-person view",
+    "  WASD - Fly drone  Mouse - Yaw",
+    "  ESC - Exit FPV",
+    "",
+    "Placement Mode:",
+    "  J - Toggle placement mode",
+    "  Arrows - Move cursor on ground",
+    "  B - Cycle type (box/cylinder)",
+    "  +/- - Resize    Enter - Place",
+    "  Shift+J - Delete mode",
+    "  Left/Right - Select obstacle",
+    "  Del - Remove selected obstacle",
+    "",
+    "Simulation:",
+    "  P - Pause/Resume",
+    "  O - Step one tick (when paused)",
+    "",
+    "Xbox Controller:",
+    "  LStick - Move/Fly  RStick - Look",
+    "  Triggers - Zoom/Throttle",
+    "  A - Pause/Place  B - Back/Exit",
+    "  Start - FPV   D-Pad - Formations",
+    "  LB/RB - Drone lock / Size",
+    "",
+    "  H - Toggle this help  ESC - Exit",
+)
+
 class TextOverlay:
     """Text overlay system for displaying HUD information."""
     
@@ -11,10 +67,20 @@ class TextOverlay:
         self.height = height
         self.font = pygame.font.Font(None, font_size)
         self.color = color
-        self.start_time = time.time()
         
         # Create surface for text rendering
         self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        # RGBA bytes of the changed part of the surface (_texture_rect);
+        # None until prepare()
+        self._texture_data = None
+        self._texture_rect = None
+        # This frame's (source surface, position) blits and the last
+        # frame's; prepare() only redraws and re-uploads when they differ
+        self._blits = []
+        self._prepared_blits = None
+        self._texture_dirty = False
+        self._text_cache = {}  # (text, color) -> rendered surface
+        self._help_panel = None
         
         # Allocate persistent texture to avoid recreation each frame
         self._texture_id = glGenTextures(1)
@@ -26,16 +92,21 @@ class TextOverlay:
                      GL_RGBA, GL_UNSIGNED_BYTE, None)
         
     def clear(self):
-        """Clear the overlay surface."""
-        self.surface.fill((0, 0, 0, 0))  # Transparent
+        """Start laying out a new overlay frame."""
+        self._blits = []
         
     def draw_text(self, text, x, y, color=None):
         """Draw text at specified position."""
         if color is None:
             color = self.color
             
-        text_surface = self.font.render(text, True, color)
-        self.surface.blit(text_surface, (x, y))
+        key = (text, color)
+        text_surface = self._text_cache.get(key)
+        if text_surface is None:
+            if len(self._text_cache) >= _TEXT_CACHE_SIZE:
+                self._text_cache.clear()
+            text_surface = self._text_cache[key] = self.font.render(text, True, color)
+        self._blits.append((text_surface, (x, y)))
         
     def draw_fps(self, fps, x=10, y=10):
         """Draw FPS counter."""
@@ -60,67 +131,23 @@ class TextOverlay:
         self.draw_text(f"Camera: ({pos[0]:.1f}, {pos[1]:.1f}, {pos[2]:.1f})", x, y)
         
     def draw_help_overlay(self):
-        """Draw help overlay with all controls."""
-        help_text = [
-            "DRONE SWARM SIMULATOR - CONTROLS",
-            "",
-            "Camera:",
-            "  WASD/QE - Move camera",
-            "  Mouse drag - Rotate camera",
-            "  Mouse wheel - Zoom",
-            "  R - Reset camera",
-            "  Home - Frame swarm (center on drones)",
-            "  6-9 - Lock camera to drone",
-            "",
-            "Formations:",
-            "  1 - Line    2 - Circle",
-            "  3 - Grid    4 - V-formation",
-            "  0 - Idle (no formation)",
-            "",
-            "Spawning:",
-            "  Shift+1-5 - Respawn in preset",
-            "  (Line, Circle, Grid, V, Random)",
-            "",
-            "Display:",
-            "  T - Targets   G - Grid",
-            "  X - Axes      L - Labels",
-            "  C/F - Formation connections",
-            "",
-            "FPV Mode:",
-            "  V - Toggle first-person view",
-            "  WASD - Fly drone  Mouse - Yaw",
-            "  ESC - Exit FPV",
-            "",
-            "Placement Mode:",
-            "  J - Toggle placement mode",
-            "  Arrows - Move cursor on ground",
-            "  B - Cycle type (box/cylinder)",
-            "  +/- - Resize    Enter - Place",
-            "  Shift+J - Delete mode",
-            "  Left/Right - Select obstacle",
-            "  Del - Remove selected obstacle",
-            "",
-            "Simulation:",
-            "  P - Pause/Resume",
-            "  O - Step one tick (when paused)",
-            "",
-            "Xbox Controller:",
-            "  LStick - Move/Fly  RStick - Look",
-            "  Triggers - Zoom/Throttle",
-            "  A - Pause/Place  B - Back/Exit",
-            "  Start - FPV   D-Pad - Formations",
-            "  LB/RB - Drone lock / Size",
-            "",
-            "  H - Toggle this help  ESC - Exit",
-        ]
-        
-        # Semi-transparent background
-        overlay_surf = pygame.Surface((400, len(help_text) * 20 + 40), pygame.SRCALPHA)
-        overlay_surf.fill((0, 0, 0, 180))
-        self.surface.blit(overlay_surf, (self.width - 450, 50))
+        """Draw help overlay with all controls.
+
+        The panel (background and text) is composed once and blitted as a
+        single surface.
+        """
+        if self._help_panel is None:
+            self._help_panel = self._compose_help_panel()
+        self._blits.append((self._help_panel, (self.width - 450, 50)))
+
+    def _compose_help_panel(self):
+        """Render HELP_LINES onto the semi-transparent help background."""
+        help_text = HELP_LINES
+        panel = pygame.Surface((400, len(help_text) * 20 + 40), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
         
         # Draw help text
-        y_offset = 70
+        y_offset = 20
         for line in help_text:
             if line == "DRONE SWARM SIMULATOR - CONTROLS":
                 color = (255, 255, 0)  # Yellow for title
@@ -129,13 +156,55 @@ class TextOverlay:
             else:
                 color = (255, 255, 255)  # White for normal text
                 
-            self.draw_text(line, self.width - 440, y_offset, color)
+            panel.blit(self.font.render(line, True, color), (10, y_offset))
             y_offset += 20
+        return panel
             
+    def prepare(self):
+        """Convert the surface to texture bytes (CPU only, no GL calls).
+
+        Skipped when the frame's blits match the last prepared frame's, so
+        a static HUD costs no redraw and no texture upload. Otherwise only
+        the region covered by added or removed blits is redrawn and
+        converted, so an FPS tick re-uploads one line, not the window.
+
+        Returns True when the texture content changed.
+        """
+        if self._blits == self._prepared_blits:
+            return False
+        rect = self._changed_rect()
+        self._prepared_blits = self._blits
+        if not rect:
+            return False
+        if self._texture_dirty:
+            # Not uploaded yet: keep the previous change in the upload too
+            rect = rect.union(self._texture_rect)
+        self.surface.set_clip(rect)
+        self.surface.fill((0, 0, 0, 0))  # Transparent
+        self.surface.blits(self._blits, doreturn=False)
+        self.surface.set_clip(None)
+        self._texture_data = pygame.image.tostring(
+            self.surface.subsurface(rect), "RGBA", False)
+        self._texture_rect = rect
+        self._texture_dirty = True
+        return True
+
+    def _changed_rect(self):
+        """Surface area that differs between the prepared and current blits."""
+        bounds = self.surface.get_rect()
+        if self._prepared_blits is None:
+            return bounds
+        changed = set(self._blits).symmetric_difference(self._prepared_blits)
+        if not changed:
+            return bounds  # same blits in a different order
+        rects = [source.get_rect(topleft=pos) for source, pos in changed]
+        return rects[0].unionall(rects[1:]).clip(bounds)
+
     def render_to_screen(self):
-        """Render the overlay to the OpenGL context using persistent texture."""
-        # Convert pygame surface to OpenGL texture data
-        texture_data = pygame.image.tostring(self.surface, "RGBA", False)
+        """Render the last prepared overlay using the persistent texture."""
+        texture_data = self._texture_data
+        if texture_data is None:
+            return
         
         # Save current OpenGL state
         glPushAttrib(GL_ALL_ATTRIB_BITS)
@@ -158,9 +227,12 @@ class TextOverlay:
         
         # Bind and update persistent texture (do not recreate)
         glBindTexture(GL_TEXTURE_2D, self._texture_id)
-        # Update texture data without reallocating
-        glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, self.width, self.height,
-                       GL_RGBA, GL_UNSIGNED_BYTE, texture_data)
+        if self._texture_dirty:
+            # Update the changed region without reallocating
+            x, y, w, h = self._texture_rect
+            glTexSubImage2D(GL_TEXTURE_2D, 0, x, y, w, h,
+                           GL_RGBA, GL_UNSIGNED_BYTE, texture_data)
+            self._texture_dirty = False
         
         # Draw textured quad
         glEnable(GL_TEXTURE_2D)
@@ -190,6 +262,9 @@ class TextOverlay:
         self.width = width
         self.height = height
         self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self._texture_data = None  # sized for the old texture
+        self._prepared_blits = None
+        self._texture_dirty = False
         
         # Reallocate texture for new size
         if hasattr(self, '_texture_id'):
@@ -358,7 +358,6 @@ class Renderer:
         viewport = glGetIntegerv(GL_VIEWPORT)
         
         try:
-            from OpenGL.GLU import gluProject
             screen_x, screen_y, screen_z = gluProject(
                 label_pos[0], label_pos[1], label_pos[2],
                 modelview, projection, viewport
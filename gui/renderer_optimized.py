@@ -32,6 +32,24 @@ class Renderer:
         
         # Set up projection matrix
         self.setup_projection()
+
+        # Drone mesh for batched drawing (see draw_drones)
+        self._drone_model = self._build_drone_model()
+        self._drone_capacity = 0
+        # Buffer objects for the drone vertices, colors and body normals
+        self._drone_vbos = glGenBuffers(3)
+        self._allocate_drone_buffers(64)
+        # Formation-connection endpoint indices, keyed by (formation, drone count)
+        self._connection_indices = {}
+        # Compiled display lists for static scenery, keyed by draw arguments
+        self._static_lists = {}
+        # Target wireframe sphere line lists, keyed by radius, and the
+        # float32 staging arrays draw_all_targets fills each frame
+        self._target_models = {}
+        self._target_vertices = np.empty((0, 3), dtype=np.float32)
+        self._target_colors = np.empty((0, 3), dtype=np.float32)
+        # Label stroke vertices, keyed by drone ID (see _label_glyph)
+        self._label_glyphs = {}
         
     def setup_projection(self):
         """Set up the projection matrix."""
@@ -61,114 +79,233 @@ class Renderer:
         glEnable(GL_LIGHTING)
         
     def draw_all_drones(self, drone_states, size=0.5, locked_drone_id=None):
-        """Draw all drones as quad-prop models with lighting enabled."""
-        for drone_state in drone_states:
-            position = drone_state['position']
-            color = drone_state['color']
-            settled = drone_state['settled']
-            crashed = drone_state.get('crashed', False)
-            orientation = drone_state.get('orientation', [0, 0, 0])
-            self._draw_quad_drone(position, orientation, color, size, settled, crashed)
-            # Highlight locked/selected drone
-            if locked_drone_id is not None and drone_state['id'] == locked_drone_id:
-                self._draw_drone_highlight(position, size)
-
-    def _draw_quad_drone(self, position, orientation, color, size, settled, crashed):
-        """Draw a single drone as a quad-prop model with body, arms, motors, and direction."""
-        scale = size * (0.7 if crashed else 1.0)
-
-        # Color selection
-        if crashed:
-            r, g, b = color[0] * 0.3, color[1] * 0.3, color[2] * 0.3
-        elif settled:
-            r, g, b = min(1.0, color[0] * 1.2), min(1.0, color[1] * 1.2), min(1.0, color[2] * 1.2)
-        else:
-            r, g, b = color[0], color[1], color[2]
-
-        roll, pitch, yaw = orientation
-
-        glPushMatrix()
-        glTranslatef(position[0], position[1], position[2])
-
-        # Apply orientation (yaw, pitch, roll — applied in reverse order)
-        glRotatef(math.degrees(yaw), 0, 1, 0)
-        glRotatef(math.degrees(pitch), 1, 0, 0)
-        glRotatef(math.degrees(roll), 0, 0, 1)
-
-        # --- Body: flat box ---
-        bx = scale * 0.35
-        by = scale * 0.07
-        bz = scale * 0.35
-        glColor3f(r, g, b)
-        glBegin(GL_QUADS)
-        # Top
-        glNormal3f(0, 1, 0)
-        glVertex3f(-bx, by, -bz); glVertex3f(-bx, by, bz)
-        glVertex3f(bx, by, bz); glVertex3f(bx, by, -bz)
-        # Bottom
-        glNormal3f(0, -1, 0)
-        glVertex3f(-bx, -by, -bz); glVertex3f(bx, -by, -bz)
-        glVertex3f(bx, -by, bz); glVertex3f(-bx, -by, bz)
-        # Front (+Z)
-        glNormal3f(0, 0, 1)
-        glVertex3f(-bx, -by, bz); glVertex3f(bx, -by, bz)
-        glVertex3f(bx, by, bz); glVertex3f(-bx, by, bz)
-        # Back (-Z)
-        glNormal3f(0, 0, -1)
-        glVertex3f(-bx, -by, -bz); glVertex3f(-bx, by, -bz)
-        glVertex3f(bx, by, -bz); glVertex3f(bx, -by, -bz)
-        # Right (+X)
-        glNormal3f(1, 0, 0)
-        glVertex3f(bx, -by, -bz); glVertex3f(bx, by, -bz)
-        glVertex3f(bx, by, bz); glVertex3f(bx, -by, bz)
-        # Left (-X)
-        glNormal3f(-1, 0, 0)
-        glVertex3f(-bx, -by, -bz); glVertex3f(-bx, -by, bz)
-        glVertex3f(-bx, by, bz); glVertex3f(-bx, by, -bz)
-        glEnd()
+        """Draw all drones of a SwarmStateArrays snapshot with lighting enabled."""
+        n = len(drone_states)
+        if n == 0:
+            return
+        self.draw_drones(drone_states.positions, drone_states.orientations,
+                         drone_states.colors, drone_states.settled,
+                         drone_states.crashed, size)
+
+        # Highlight locked/selected drone
+        if locked_drone_id is not None:
+            idx = drone_states.index_of(locked_drone_id)
+            if idx is not None:
+                self._draw_drone_highlight(drone_states.positions[idx], size)
+
+    def draw_drones(self, positions, orientations, colors, settled, crashed, size=0.5):
+        """Draw N quad-prop drones from structure-of-arrays inputs.
+
+        Every drone's model vertices are transformed in one batched matmul
+        and submitted with a handful of glDrawArrays calls, instead of a
+        push/rotate/immediate-mode sequence per drone. Vertices and normals
+        are uploaded to buffer objects once per call; per-vertex colors
+        are restaged and uploaded only when colors/settled/crashed change.
+
+        Args:
+            positions: (N, 3) world positions.
+            orientations: (N, 3) [roll, pitch, yaw] in radians.
+            colors: (N, 3) RGB base colors.
+            settled: (N,) bool mask.
+            crashed: (N,) bool mask.
+            size: Drone model size.
+        """
+        model = self._drone_model
+        parts = model['parts']
+        n = len(positions)
+        if n > self._drone_capacity:
+            self._allocate_drone_buffers(max(n, 2 * self._drone_capacity))
+        scale = np.where(crashed, size * 0.7, size)
+
+        # Color selection (skipped while the inputs match the uploaded ones)
+        color_src = self._drone_color_src
+        colors_stale = (color_src is None or len(color_src[0]) != n
+                        or not np.array_equal(color_src[0], colors)
+                        or not np.array_equal(color_src[1], settled)
+                        or not np.array_equal(color_src[2], crashed))
+        if colors_stale:
+            base = np.where(crashed[:, None], colors * 0.3,
+                            np.where(settled[:, None], np.minimum(1.0, colors * 1.2), colors))
+            part_colors = {
+                'body': base,
+                'arms': base * 0.7,
+                'motors': np.minimum(1.0, base + 0.3),
+            }
+
+        rot_t = self._rotation_matrices(orientations).transpose(0, 2, 1)
+
+        # Transform all model vertices of all drones at once: (N, V, 3)
+        local = self._drone_local[:n]
+        world = self._drone_world[:n]
+        np.multiply(scale[:, None, None], model['scaled'], out=local)
+        local += model['offset']
+        np.matmul(local, rot_t, out=world)
+        world += positions[:, None, :]
+
+        # Stage into the persistent float32 arrays, part-major so each part
+        # is one contiguous range of n * count vertices
+        vertices = self._drone_vertices
+        vertex_colors = self._drone_colors
+        for name, (first, count) in parts.items():
+            block = slice(n * first, n * (first + count))
+            vertices[block].reshape(n, count, 3)[:] = world[:, first:first + count]
+            if colors_stale:
+                rgb = part_colors.get(name)
+                if rgb is not None:
+                    vertex_colors[block].reshape(n, count, 3)[:] = rgb[:, None, :]
+        body_first, body_count = parts['body']
+        normals = self._drone_normals[:n * body_count]
+        normals.reshape(n, body_count, 3)[:] = model['normals'] @ rot_t
+
+        vertex_vbo, color_vbo, normal_vbo = self._drone_vbos
+        used = n * len(model['scaled'])
+        glBindBuffer(GL_ARRAY_BUFFER, vertex_vbo)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, used * 12, vertices[:used])
+        if colors_stale:
+            glBindBuffer(GL_ARRAY_BUFFER, color_vbo)
+            glBufferSubData(GL_ARRAY_BUFFER, 0, used * 12, vertex_colors[:used])
+            self._drone_color_src = (colors.copy(), settled.copy(), crashed.copy())
+        glBindBuffer(GL_ARRAY_BUFFER, normal_vbo)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, normals.nbytes, normals)
+
+        def draw(mode, name):
+            first, count = parts[name]
+            glDrawArrays(mode, n * first, n * count)
+
+        # Pointers are offsets into the bound buffer objects
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, vertex_vbo)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ARRAY_BUFFER, color_vbo)
+        glColorPointer(3, GL_FLOAT, 0, None)
+
+        # --- Body: flat box (lit) ---
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, normal_vbo)
+        glNormalPointer(GL_FLOAT, 0, None)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        draw(GL_QUADS, 'body')
+        glDisableClientState(GL_NORMAL_ARRAY)
 
-        # --- Arms: 4 lines in X pattern (45 degree diagonals) ---
-        arm_len = scale * 0.7
-        arm_y = by  # arm height at top of body
         glDisable(GL_LIGHTING)
-        glColor3f(r * 0.7, g * 0.7, b * 0.7)
+
+        # --- Arms: 4 lines in X pattern ---
         glLineWidth(3.0)
-        glBegin(GL_LINES)
-        for dx, dz in [(1, 1), (1, -1), (-1, -1), (-1, 1)]:
-            glVertex3f(0, arm_y, 0)
-            glVertex3f(dx * arm_len, arm_y, dz * arm_len)
-        glEnd()
+        draw(GL_LINES, 'arms')
 
         # --- Motor discs at arm tips ---
-        motor_r = scale * 0.12
-        quadric = gluNewQuadric()
-        glColor3f(min(1.0, r + 0.3), min(1.0, g + 0.3), min(1.0, b + 0.3))
-        for dx, dz in [(1, 1), (1, -1), (-1, -1), (-1, 1)]:
-            glPushMatrix()
-            glTranslatef(dx * arm_len, arm_y + 0.01, dz * arm_len)
-            glRotatef(-90, 1, 0, 0)  # face upward
-            gluDisk(quadric, 0, motor_r, 12, 1)
-            glPopMatrix()
-        gluDeleteQuadric(quadric)
+        draw(GL_TRIANGLES, 'motors')
 
-        # --- Direction indicator: bright line pointing forward (+Z local) ---
-        glColor3f(1.0, 1.0, 1.0)  # white nose line
+        glDisableClientState(GL_COLOR_ARRAY)
+
+        # --- Direction indicator: white nose line and arrowhead ---
+        glColor3f(1.0, 1.0, 1.0)
         glLineWidth(4.0)
-        glBegin(GL_LINES)
-        glVertex3f(0, by + 0.02, bz)
-        glVertex3f(0, by + 0.02, bz + scale * 0.5)
-        glEnd()
-        # Small arrowhead
-        glBegin(GL_TRIANGLES)
-        arrow_tip = bz + scale * 0.55
-        arrow_base = bz + scale * 0.4
-        glVertex3f(0, by + 0.02, arrow_tip)
-        glVertex3f(-scale * 0.08, by + 0.02, arrow_base)
-        glVertex3f(scale * 0.08, by + 0.02, arrow_base)
-        glEnd()
+        draw(GL_LINES, 'nose')
+        draw(GL_TRIANGLES, 'arrow')
 
+        glDisableClientState(GL_VERTEX_ARRAY)
         glEnable(GL_LIGHTING)
-        glPopMatrix()
+
+    def _allocate_drone_buffers(self, capacity):
+        """(Re)allocate the draw_drones scratch and staging arrays for `capacity` drones."""
+        verts = len(self._drone_model['scaled'])
+        body_count = self._drone_model['parts']['body'][1]
+        self._drone_capacity = capacity
+        self._drone_local = np.empty((capacity, verts, 3))
+        self._drone_world = np.empty((capacity, verts, 3))
+        self._drone_vertices = np.empty((capacity * verts, 3), dtype=np.float32)
+        self._drone_colors = np.zeros((capacity * verts, 3), dtype=np.float32)
+        self._drone_normals = np.empty((capacity * body_count, 3), dtype=np.float32)
+        # GL-side storage to match; colors must be restaged into it
+        for vbo, array in zip(self._drone_vbos, (self._drone_vertices,
+                                                 self._drone_colors,
+                                                 self._drone_normals)):
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glBufferData(GL_ARRAY_BUFFER, array.nbytes, None, GL_STREAM_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self._drone_color_src = None
+
+    @staticmethod
+    def _rotation_matrices(orientations):
+        """(N, 3) [roll, pitch, yaw] -> (N, 3, 3) matrices for Ry(yaw) Rx(pitch) Rz(roll)."""
+        roll, pitch, yaw = orientations[:, 0], orientations[:, 1], orientations[:, 2]
+        cr, sr = np.cos(roll), np.sin(roll)
+        cp, sp = np.cos(pitch), np.sin(pitch)
+        cy, sy = np.cos(yaw), np.sin(yaw)
+        rot = np.empty((len(orientations), 3, 3))
+        rot[:, 0, 0] = cy * cr + sy * sp * sr
+        rot[:, 0, 1] = -cy * sr + sy * sp * cr
+        rot[:, 0, 2] = sy * cp
+        rot[:, 1, 0] = cp * sr
+        rot[:, 1, 1] = cp * cr
+        rot[:, 1, 2] = -sp
+        rot[:, 2, 0] = -sy * cr + cy * sp * sr
+        rot[:, 2, 1] = sy * sr + cy * sp * cr
+        rot[:, 2, 2] = cy * cp
+        return rot
+
+    @staticmethod
+    def _build_drone_model():
+        """Unit quad-prop model in drone-local coordinates.
+
+        All parts share one vertex list; 'parts' maps each part to its
+        (first, count) range. Vertices are scaled * size + offset, where
+        offset holds the small fixed lifts that do not scale with the drone.
+        """
+        bx, by, bz = 0.35, 0.07, 0.35
+        body = [
+            # Top
+            (-bx, by, -bz), (-bx, by, bz), (bx, by, bz), (bx, by, -bz),
+            # Bottom
+            (-bx, -by, -bz), (bx, -by, -bz), (bx, -by, bz), (-bx, -by, bz),
+            # Front (+Z)
+            (-bx, -by, bz), (bx, -by, bz), (bx, by, bz), (-bx, by, bz),
+            # Back (-Z)
+            (-bx, -by, -bz), (-bx, by, -bz), (bx, by, -bz), (bx, -by, -bz),
+            # Right (+X)
+            (bx, -by, -bz), (bx, by, -bz), (bx, by, bz), (bx, -by, bz),
+            # Left (-X)
+            (-bx, -by, -bz), (-bx, -by, bz), (-bx, by, bz), (-bx, by, -bz),
+        ]
+        body_normals = np.repeat([(0, 1, 0), (0, -1, 0), (0, 0, 1),
+                                  (0, 0, -1), (1, 0, 0), (-1, 0, 0)], 4, axis=0)
+
+        arm_len = 0.7
+        tips = [(1, 1), (1, -1), (-1, -1), (-1, 1)]
+        arms = []
+        for dx, dz in tips:
+            arms += [(0, by, 0), (dx * arm_len, by, dz * arm_len)]
+
+        # Motor discs as triangle fans (12 slices, as gluDisk), facing up
+        motor_r = 0.12
+        angles = np.linspace(0.0, 2.0 * math.pi, 13)
+        motors = []
+        for dx, dz in tips:
+            cx, cz = dx * arm_len, dz * arm_len
+            for a0, a1 in zip(angles[:-1], angles[1:]):
+                motors += [(cx, by, cz),
+                           (cx + motor_r * math.sin(a0), by, cz - motor_r * math.cos(a0)),
+                           (cx + motor_r * math.sin(a1), by, cz - motor_r * math.cos(a1))]
+
+        nose = [(0, by, bz), (0, by, bz + 0.5)]
+        arrow = [(0, by, bz + 0.55), (-0.08, by, bz + 0.4), (0.08, by, bz + 0.4)]
+
+        scaled, offset, parts = [], [], {}
+        for name, verts, lift in (('body', body, 0.0), ('arms', arms, 0.0),
+                                  ('motors', motors, 0.01), ('nose', nose, 0.02),
+                                  ('arrow', arrow, 0.02)):
+            parts[name] = (len(scaled), len(verts))
+            scaled += verts
+            offset += [(0.0, lift, 0.0)] * len(verts)
+
+        return {
+            'scaled': np.array(scaled, dtype=float),
+            'offset': np.array(offset, dtype=float),
+            'normals': body_normals.astype(float),
+            'parts': parts,
+        }
 
     def _draw_drone_highlight(self, position, size):
         """Draw a bright ring around the selected/locked drone."""
@@ -187,27 +324,86 @@ class Renderer:
         glEnable(GL_LIGHTING)
 
     def draw_all_targets(self, drone_states, size=0.2):
-        """Draw all target positions in a single batch without lighting."""
-        for drone_state in drone_states:
-            position = drone_state['target']
-            color = drone_state['color']
-            
-            glPushMatrix()
-            glTranslatef(position[0], position[1], position[2])
-            
-            glColor3f(*color)
-            glLineWidth(1.0)
-            
-            # Draw wireframe sphere
-            sphere = gluNewQuadric()
-            gluQuadricDrawStyle(sphere, GLU_LINE)
-            gluSphere(sphere, size, 8, 8)
-            gluDeleteQuadric(sphere)
-            
-            glPopMatrix()
-        
+        """Draw all target positions as wireframe spheres, without lighting.
+
+        One line-list sphere model (cached per size) is offset to every
+        target and drawn with a single glDrawArrays(GL_LINES) call.
+        """
+        n = len(drone_states)
+        if n == 0:
+            return
+        model = self._target_models.get(size)
+        if model is None:
+            model = self._target_models[size] = self._build_target_sphere(size)
+        count = len(model)
+        if n * count > len(self._target_vertices):
+            self._target_vertices = np.empty((2 * n * count, 3), dtype=np.float32)
+            self._target_colors = np.empty((2 * n * count, 3), dtype=np.float32)
+        vertices = self._target_vertices[:n * count]
+        vertex_colors = self._target_colors[:n * count]
+        np.add(drone_states.targets[:, None, :], model,
+               out=vertices.reshape(n, count, 3), casting='same_kind')
+        vertex_colors.reshape(n, count, 3)[:] = drone_states.colors[:, None, :]
+
+        glLineWidth(1.0)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, vertices)
+        glColorPointer(3, GL_FLOAT, 0, vertex_colors)
+        glDrawArrays(GL_LINES, 0, n * count)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    @staticmethod
+    def _build_target_sphere(radius, slices=8, stacks=8):
+        """Line-list vertices matching gluSphere(radius, slices, stacks) in GLU_LINE style.
+
+        GLU draws the inner latitude rings and the meridians as line
+        strips; each strip is expanded to segment pairs here.
+        """
+        theta = 2.0 * np.pi * np.arange(slices + 1) / slices
+        theta[-1] = 0.0  # close the rings exactly, as GLU does
+        phi = np.pi * np.arange(stacks + 1) / stacks
+        sin_t, cos_t = np.sin(theta), np.cos(theta)
+        sin_p, cos_p = radius * np.sin(phi), radius * np.cos(phi)
+        sin_p[[0, -1]] = 0.0  # poles come to a point
+
+        # Latitude rings for stacks 1..stacks-1: (stacks-1, slices+1, 3)
+        rings = np.stack(np.broadcast_arrays(
+            sin_p[1:-1, None] * sin_t, sin_p[1:-1, None] * cos_t,
+            cos_p[1:-1, None]), axis=-1)
+        # Meridians for each slice: (slices, stacks+1, 3)
+        meridians = np.stack(np.broadcast_arrays(
+            sin_t[:-1, None] * sin_p, cos_t[:-1, None] * sin_p,
+            cos_p), axis=-1)
+
+        def segments(strips):
+            return np.stack([strips[:, :-1], strips[:, 1:]], axis=2).reshape(-1, 3)
+
+        return np.concatenate([segments(rings), segments(meridians)])
+
+    def _call_static_list(self, key, emit, *args):
+        """Replay static geometry from a display list, compiling it on first use."""
+        display_list = self._static_lists.get(key)
+        if display_list is None:
+            display_list = glGenLists(1)
+            glNewList(display_list, GL_COMPILE)
+            emit(*args)
+            glEndList()
+            self._static_lists[key] = display_list
+        glCallList(display_list)
+
     def draw_grid(self, size=50, spacing=5):
         """Draw a grid on the ground plane (unlit)."""
+        self._call_static_list(('grid', size, spacing), self._emit_grid, size, spacing)
+
+    def draw_axes(self, length=10):
+        """Draw coordinate axes with labels (unlit)."""
+        self._call_static_list(('axes', length), self._emit_axes, length)
+
+    @staticmethod
+    def _emit_grid(size, spacing):
+        """Issue the immediate-mode calls for the ground grid."""
         glColor3f(0.3, 0.3, 0.3)
         glLineWidth(1.0)
         
@@ -221,8 +417,9 @@ class Renderer:
             glVertex3f(i, 0, size//2)
         glEnd()
         
-    def draw_axes(self, length=10):
-        """Draw coordinate axes with labels (unlit)."""
+    @staticmethod
+    def _emit_axes(length):
+        """Issue the immediate-mode calls for the labelled axes."""
         glLineWidth(3.0)
 
         glBegin(GL_LINES)
@@ -278,138 +475,145 @@ class Renderer:
         glEnd()
         
     def draw_formation_connections(self, drone_states, formation_type):
-        """Draw lines connecting drones in formation (unlit)."""
-        if formation_type == "line" or len(drone_states) < 2:
+        """Draw lines connecting drones in formation (unlit).
+
+        Endpoints are gathered from the packed positions with one index
+        array per (formation, drone count) and drawn with a single
+        glDrawArrays(GL_LINES) call.
+        """
+        n = len(drone_states)
+        if formation_type == "line" or n < 2:
+            return
+        key = (formation_type, n)
+        indices = self._connection_indices.get(key)
+        if indices is None:
+            indices = self._connection_indices[key] = self._build_connection_indices(formation_type, n)
+        if len(indices) == 0:
             return
             
+        vertices = drone_states.positions[indices].astype(np.float32)
+        
         glColor3f(0.5, 0.5, 0.5)
         glLineWidth(1.0)
-        
-        positions = [drone['position'] for drone in drone_states]
-        
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, vertices)
+        glDrawArrays(GL_LINES, 0, len(vertices))
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    @staticmethod
+    def _build_connection_indices(formation_type, n):
+        """Flattened (i, j) endpoint pairs for a formation of n drones."""
+        i = np.arange(n, dtype=np.intp)
         if formation_type == "circle":
-            # Connect adjacent drones in circle
-            glBegin(GL_LINE_LOOP)
-            for pos in positions:
-                glVertex3f(pos[0], pos[1], pos[2])
-            glEnd()
-            
+            # Connect adjacent drones, closing the loop
+            pairs = np.stack([i, np.roll(i, -1)], axis=1)
         elif formation_type == "v_formation":
-            # Connect to lead drone
-            if len(positions) > 0:
-                lead_pos = positions[0]
-                glBegin(GL_LINES)
-                for pos in positions[1:]:
-                    glVertex3f(lead_pos[0], lead_pos[1], lead_pos[2])
-                    glVertex3f(pos[0], pos[1], pos[2])
-                glEnd()
-                
+            # Connect every drone to the lead drone
+            pairs = np.stack([np.zeros(n - 1, dtype=np.intp), i[1:]], axis=1)
         elif formation_type == "grid":
-            # Connect drones in grid pattern
-            grid_size = int(len(drone_states) ** 0.5)
-            if grid_size * grid_size == len(drone_states):
-                glBegin(GL_LINES)
-                for i in range(len(positions)):
-                    row, col = divmod(i, grid_size)
-                    
-                    # Connect to right neighbor
-                    if col < grid_size - 1:
-                        right_idx = i + 1
-                        if right_idx < len(positions):
-                            glVertex3f(positions[i][0], positions[i][1], positions[i][2])
-                            glVertex3f(positions[right_idx][0], positions[right_idx][1], positions[right_idx][2])
-                    
-                    # Connect to bottom neighbor
-                    if row < grid_size - 1:
-                        bottom_idx = i + grid_size
-                        if bottom_idx < len(positions):
-                            glVertex3f(positions[i][0], positions[i][1], positions[i][2])
-                            glVertex3f(positions[bottom_idx][0], positions[bottom_idx][1], positions[bottom_idx][2])
-                glEnd()
+            # Connect right and bottom neighbours; only for square counts
+            grid_size = int(n ** 0.5)
+            if grid_size * grid_size != n:
+                return np.empty(0, dtype=np.intp)
+            grid = i.reshape(grid_size, grid_size)
+            right = np.stack([grid[:, :-1].ravel(), grid[:, 1:].ravel()], axis=1)
+            bottom = np.stack([grid[:-1, :].ravel(), grid[1:, :].ravel()], axis=1)
+            pairs = np.concatenate([right, bottom])
+        else:
+            return np.empty(0, dtype=np.intp)
+        return pairs.ravel()
     
     def draw_all_labels(self, drone_states, camera_pos):
-        """Draw all drone labels in a batch (unlit, no depth test)."""
+        """Draw all drone labels in a batch (unlit, no depth test).
+
+        Label anchors are projected to the screen with one matrix product
+        (the gluProject math, vectorized) and every digit stroke is drawn
+        with a single glDrawArrays(GL_LINES) call.
+        """
+        n = len(drone_states)
+        if n == 0:
+            return
         glDisable(GL_DEPTH_TEST)
         
         # Get matrices once for all labels
         modelview = glGetDoublev(GL_MODELVIEW_MATRIX)
         projection = glGetDoublev(GL_PROJECTION_MATRIX)
         viewport = glGetIntegerv(GL_VIEWPORT)
-        
-        # Set up 2D projection once
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        glOrtho(0, viewport[2], viewport[3], 0, -1, 1)
-        
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
-        
-        for drone_state in drone_states:
-            position = drone_state['position']
-            drone_id = drone_state['id']
-            color = drone_state['color']
+
+        # Label anchors 1 meter above each drone, to window coordinates.
+        # GL matrices are column-major, so row vectors multiply on the left
+        anchors = np.ones((n, 4))
+        anchors[:, :3] = drone_states.positions
+        anchors[:, 1] += 1.0
+        clip = anchors @ modelview @ projection
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ndc = clip[:, :3] / clip[:, 3:]
+        window = (ndc * 0.5 + 0.5) * [viewport[2], viewport[3], 1.0] + [viewport[0], viewport[1], 0.0]
+        # Only label drones in front of the camera (NaN/inf depth fails too)
+        visible = np.flatnonzero((window[:, 2] > 0) & (window[:, 2] < 1))
+
+        glyphs = [self._label_glyph(drone_id) for drone_id in drone_states.ids[visible].tolist()]
+        counts = [len(glyph) for glyph in glyphs]
+        if sum(counts) > 0:
+            vertices = np.concatenate(glyphs)
+            vertices += np.repeat(window[visible, :2], counts, axis=0)
+            vertices = vertices.astype(np.float32)
+            colors = np.repeat(drone_states.colors[visible], counts, axis=0).astype(np.float32)
+
+            # Set up 2D projection once
+            glMatrixMode(GL_PROJECTION)
+            glPushMatrix()
+            glLoadIdentity()
+            glOrtho(0, viewport[2], viewport[3], 0, -1, 1)
             
-            # Calculate label position
-            label_offset = np.array([0, 1.0, 0])  # 1 meter above drone
-            label_pos = np.array(position) + label_offset
+            glMatrixMode(GL_MODELVIEW)
+            glPushMatrix()
+            glLoadIdentity()
+
+            glLineWidth(2.0)
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glVertexPointer(2, GL_FLOAT, 0, vertices)
+            glColorPointer(3, GL_FLOAT, 0, colors)
+            glDrawArrays(GL_LINES, 0, len(vertices))
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
             
-            try:
-                from OpenGL.GLU import gluProject
-                screen_x, screen_y, screen_z = gluProject(
-                    label_pos[0], label_pos[1], label_pos[2],
-                    modelview, projection, viewport
-                )
-                
-                # Only draw if in front of camera
-                if 0 < screen_z < 1:
-                    glColor3f(*color)
-                    glLineWidth(2.0)
-                    # Draw drone ID number as simple lines
-                    self._draw_number(int(drone_id), screen_x, screen_y)
-                    
-            except Exception:
-                pass  # Skip label if projection fails
-        
-        # Restore matrices once
-        glPopMatrix()
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
+            # Restore matrices once
+            glPopMatrix()
+            glMatrixMode(GL_PROJECTION)
+            glPopMatrix()
+            glMatrixMode(GL_MODELVIEW)
         
         glEnable(GL_DEPTH_TEST)
         
-    def _draw_number(self, num, x, y):
-        """Draw a simple number at screen position."""
+    def _label_glyph(self, num):
+        """Line-segment vertices (k, 2) spelling a drone ID, relative to its anchor."""
+        glyph = self._label_glyphs.get(num)
+        if glyph is not None:
+            return glyph
         # Basic number rendering with line segments
         # Simplified for performance
-        digit_str = str(num)
+        segments = []
         offset = 0
-        
-        for digit_char in digit_str:
+        for digit_char in str(num):
             digit = int(digit_char)
             
             # Draw simplified digit (just a few lines)
-            glBegin(GL_LINES)
             if digit == 0:
                 # Draw O shape
-                glVertex2f(x + offset, y)
-                glVertex2f(x + offset + 5, y)
-                glVertex2f(x + offset, y)
-                glVertex2f(x + offset, y + 10)
-                glVertex2f(x + offset + 5, y)
-                glVertex2f(x + offset + 5, y + 10)
-                glVertex2f(x + offset, y + 10)
-                glVertex2f(x + offset + 5, y + 10)
+                segments += [(offset, 0), (offset + 5, 0),
+                             (offset, 0), (offset, 10),
+                             (offset + 5, 0), (offset + 5, 10),
+                             (offset, 10), (offset + 5, 10)]
             elif digit == 1:
                 # Draw vertical line
-                glVertex2f(x + offset + 2, y)
-                glVertex2f(x + offset + 2, y + 10)
+                segments += [(offset + 2, 0), (offset + 2, 10)]
             # Add more digits as needed
-            glEnd()
             
             offset += 8  # Space between digits
+        glyph = self._label_glyphs[num] = np.array(segments, dtype=float).reshape(-1, 2)
+        return glyph
 
     def draw_box(self, position, size, color):
         """Draw an axis-aligned box. Position is center, size is full extents."""
@@ -6,6 +6,7 @@ flight controller.
 """
 
 import time
+from typing import Callable, Optional
 import numpy as np
 from hal.drone_hal import DroneHAL
 from hal.types import IMUReading, GPSReading, AltitudeReading, BatteryReading, DroneStatus
@@ -19,13 +20,20 @@ class SimHAL(DroneHAL):
     the flight controller.
     """
 
-    def __init__(self, drone):
+    def __init__(self, drone, on_command: Optional[Callable[[], None]] = None):
         """Wrap a simulation Drone object.
 
         Args:
             drone: A simulation.drone.Drone instance.
+            on_command: Called after every actuator or lifecycle command,
+                e.g. to get the new state published while paused.
         """
         self._drone = drone
+        self._on_command = on_command
+
+    def _commanded(self):
+        if self._on_command is not None:
+            self._on_command()
 
     # ── Sensor reads ─────────────────────────────────────────────
 
@@ -90,27 +98,32 @@ class SimHAL(DroneHAL):
     def set_position(self, x: float, y: float, z: float, yaw: float = 0.0):
         """Command position through the flight controller."""
         self._drone.set_target(np.array([x, y, z], dtype=float))
+        self._commanded()
 
     def set_velocity(self, vx: float, vy: float, vz: float, yaw_rate: float = 0.0):
         """Command velocity through the flight controller."""
         self._drone.controller.set_velocity(
             np.array([vx, vy, vz], dtype=float), yaw_rate
         )
+        self._commanded()
 
     def set_attitude(self, roll: float, pitch: float, yaw_rate: float, thrust: float):
         """Command attitude directly through the flight controller."""
         self._drone.controller.set_attitude(roll, pitch, yaw_rate, thrust)
+        self._commanded()
 
     # ── Lifecycle commands ───────────────────────────────────────
 
     def arm(self) -> bool:
         """Arm through the flight controller."""
         self._drone.controller.arm()
+        self._commanded()
         return True
 
     def disarm(self) -> bool:
         """Disarm through the flight controller."""
         self._drone.controller.disarm()
+        self._commanded()
         return True
 
     def takeoff(self, altitude: float) -> bool:
@@ -118,11 +131,13 @@ class SimHAL(DroneHAL):
         if not self._drone.controller.armed:
             return False
         self._drone.controller.takeoff(altitude)
+        self._commanded()
         return True
 
     def land(self) -> bool:
         """Land through the flight controller."""
         self._drone.controller.land()
+        self._commanded()
         return True
 
     # ── Identity ─────────────────────────────────────────────────
@@ -11,6 +11,7 @@ import time
 import argparse
 import signal
 import atexit
+from simulation.config import load_config
 from simulation.simulator import Simulator
 
 # Global variables for cleanup
@@ -57,20 +58,20 @@ signal.signal(signal.SIGINT, signal_handler)  # Ctrl+C
 if hasattr(signal, 'SIGTERM'):
     signal.signal(signal.SIGTERM, signal_handler)  # Termination
 
-def run_headless_simulation(config_path="config.yaml"):
+def run_headless_simulation(config_path="config.yaml", config=None):
     """Run simulation without GUI (headless mode)."""
     global active_simulator
     
     print("Starting headless drone swarm simulation...")
     
-    simulator = Simulator(config_path)
+    simulator = Simulator(config_path, config)
     active_simulator = simulator  # Register for cleanup
     simulator.start()
     
     try:
         formation_patterns = ["line", "circle", "grid", "v_formation"]
         pattern_index = 0
-        last_formation_time = time.time()
+        last_formation_time = time.monotonic()
         
         print("Simulation running. Press Ctrl+C to stop.")
         print("Cycling through formations every 10 seconds...")
@@ -86,11 +87,11 @@ def run_headless_simulation(config_path="config.yaml"):
                   f"Settled: {settled_count}/{len(drone_states)}", end="")
             
             # Change formation every 10 seconds
-            if time.time() - last_formation_time > 10:
+            if time.monotonic() - last_formation_time > 10:
                 formation = formation_patterns[pattern_index]
                 simulator.set_formation(formation)
                 pattern_index = (pattern_index + 1) % len(formation_patterns)
-                last_formation_time = time.time()
+                last_formation_time = time.monotonic()
                 print(f"\\nSwitching to {formation} formation...")
                 
             time.sleep(0.1)
@@ -101,13 +102,13 @@ def run_headless_simulation(config_path="config.yaml"):
         simulator.stop()
 
 def run_api_server(config_path="config.yaml", host="0.0.0.0", port=8000,
-                   cors_origins=None, ws_push_rate=10.0):
+                   cors_origins=None, ws_push_rate=10.0, config=None):
     """Run simulation with REST/WebSocket API server."""
     global active_simulator
 
     print(f"Starting API server on {host}:{port}...")
 
-    simulator = Simulator(config_path)
+    simulator = Simulator(config_path, config)
     active_simulator = simulator
     simulator.start()
 
@@ -133,14 +134,14 @@ def run_api_server(config_path="config.yaml", host="0.0.0.0", port=8000,
         simulator.stop()
 
 
-def run_gui_simulation(config_path="config.yaml"):
+def run_gui_simulation(config_path="config.yaml", config=None):
     """Run simulation with 3D GUI."""
     global active_gui
     
     try:
         from gui.main import DroneSwarmGUI
         print("Starting 3D GUI...")
-        gui = DroneSwarmGUI(config_path)
+        gui = DroneSwarmGUI(config_path, config)
         active_gui = gui  # Register for cleanup
         gui.run()  # GUI internally calls simulator.start()
     except KeyboardInterrupt:
@@ -180,8 +181,7 @@ def main():
     
     # Load configuration
     try:
-        with open(args.config, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_config(args.config)
     except FileNotFoundError:
         print(f"Error: Configuration file '{args.config}' not found.")
         sys.exit(1)
@@ -236,11 +236,12 @@ def main():
         cors_origins = api_cfg.get('cors_origins', ['*'])
         ws_push_rate = api_cfg.get('ws_push_rate', 10.0)
         run_api_server(args.config, host=host, port=port,
-                       cors_origins=cors_origins, ws_push_rate=ws_push_rate)
+                       cors_origins=cors_origins, ws_push_rate=ws_push_rate,
+                       config=config)
     elif use_gui:
-        run_gui_simulation(args.config)
+        run_gui_simulation(args.config, config)
     else:
-        run_headless_simulation(args.config)
+        run_headless_simulation(args.config, config)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,19 @@
+"""YAML configuration loading."""
+
+from typing import Any, Dict
+
+import yaml
+
+# libyaml's C parser when PyYAML was built against it, else pure Python
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """Parse a YAML config file with the fastest available safe loader.
+
+    Raises:
+        FileNotFoundError: If config_path does not exist.
+        yaml.YAMLError: If the file is not valid YAML.
+    """
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=_SafeLoader)
@@ -2,6 +2,8 @@
 
 from typing import Tuple, List
 
+import numpy as np
+
 Vec3 = Tuple[float, float, float]
 
 def map_up_axis(pos: Vec3, up_axis: str) -> Vec3:
@@ -37,27 +39,26 @@ def map_positions_list(positions: List[Vec3], up_axis: str) -> List[Vec3]:
     """
     return [map_up_axis(pos, up_axis) for pos in positions]
 
-def get_bounding_box(positions: List[Vec3]) -> Tuple[Vec3, Vec3, Vec3]:
+def get_bounding_box(positions) -> Tuple[Vec3, Vec3, Vec3]:
     """Calculate bounding box and centroid for camera framing.
     
     Args:
-        positions: List of position tuples
+        positions: List of position tuples or an (N, 3) array
         
     Returns:
         Tuple of (min_pos, max_pos, centroid)
     """
-    if not positions:
+    points = np.asarray(positions, dtype=float).reshape(-1, 3)
+    if len(points) == 0:
         return (0, 0, 0), (0, 0, 0), (0, 0, 0)
     
-    xs = [p[0] for p in positions]
-    ys = [p[1] for p in positions] 
-    zs = [p[2] for p in positions]
+    # One reduction per bound over the whole array
+    lo = points.min(axis=0)
+    hi = points.max(axis=0)
     
-    min_pos = (min(xs), min(ys), min(zs))
-    max_pos = (max(xs), max(ys), max(zs))
-    centroid = ((min(xs) + max(xs)) * 0.5, 
-                (min(ys) + max(ys)) * 0.5, 
-                (min(zs) + max(zs)) * 0.5)
+    min_pos = tuple(lo.tolist())
+    max_pos = tuple(hi.tolist())
+    centroid = tuple(((lo + hi) * 0.5).tolist())
     
     return min_pos, max_pos, centroid
 
@@ -64,6 +64,10 @@ class ObstacleManager:
         self.cylinders: List[Cylinder] = []
         # Track insertion order for remove_last
         self._order: List[Tuple[str, int]] = []  # ('box', idx) or ('cyl', idx)
+        # Bumped on every add/remove so get_states() can reuse its snapshot
+        self.version = 0
+        self._states: Optional[List[Dict[str, Any]]] = None
+        self._states_version = -1
 
     def add_box(self, position, size, color=None):
         """Add an axis-aligned box obstacle.
@@ -80,6 +84,7 @@ class ObstacleManager:
         )
         self.boxes.append(box)
         self._order.append(('box', len(self.boxes) - 1))
+        self.version += 1
 
     def add_cylinder(self, position, radius, height, color=None):
         """Add a vertical cylinder obstacle.
@@ -98,6 +103,7 @@ class ObstacleManager:
         )
         self.cylinders.append(cyl)
         self._order.append(('cyl', len(self.cylinders) - 1))
+        self.version += 1
 
     def remove_last(self):
         """Remove the most recently added obstacle."""
@@ -108,6 +114,7 @@ class ObstacleManager:
             self.boxes.pop(idx)
         elif kind == 'cyl' and idx < len(self.cylinders):
             self.cylinders.pop(idx)
+        self.version += 1
 
     def remove_by_index(self, order_index: int):
         """Remove obstacle at the given position in the creation order."""
@@ -125,12 +132,14 @@ class ObstacleManager:
             for i, (k, j) in enumerate(self._order):
                 if k == 'cyl' and j > idx:
                     self._order[i] = ('cyl', j - 1)
+        self.version += 1
 
     def clear_all(self):
         """Remove all obstacles."""
         self.boxes.clear()
         self.cylinders.clear()
         self._order.clear()
+        self.version += 1
 
     def load_scene(self, scene_list: List[Dict[str, Any]]):
         """Load obstacles from a list of config dicts.
@@ -151,9 +160,14 @@ class ObstacleManager:
     def get_states(self) -> List[Dict[str, Any]]:
         """Serialize all obstacles for GUI rendering.
 
+        The snapshot is rebuilt only when the obstacle set has changed
+        (see version); callers share it and must treat it as read-only.
+
         Returns:
             List of dicts with 'type' and shape-specific fields.
         """
+        if self._states_version == self.version:
+            return self._states
         states = []
         for box in self.boxes:
             states.append({
@@ -170,6 +184,8 @@ class ObstacleManager:
                 'height': cyl.height,
                 'color': cyl.color,
             })
+        self._states = states
+        self._states_version = self.version
         return states
 
     def check_collision(self, sphere_pos: np.ndarray,
@@ -1,9 +1,9 @@
 import time
 import threading
-import queue
+from collections import deque
 from typing import Dict, Any, Optional, Callable, Tuple
 import numpy as np
-import yaml
+from simulation.config import load_config
 from simulation.swarm import Swarm
 from simulation.sensors import SensorConfig
 from simulation.environment import Environment, WindConfig
@@ -12,14 +12,14 @@ from simulation.flight_controller import FlightControllerConfig
 class Simulator:
     """Main simulation engine that manages the drone swarm."""
     
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(self, config_path: str = "config.yaml",
+                 config: Optional[Dict[str, Any]] = None):
         self._running = False
         self.paused = False
         self.lock = threading.RLock()
         
-        # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Load configuration (skipped when the caller already parsed it)
+        self.config = config if config is not None else load_config(config_path)
             
         # Initialize swarm with drone settings
         drone_config = self.config['drones']
@@ -117,6 +117,10 @@ class Simulator:
                            collision_config=self.collision_config,
                            environment=self.environment,
                            controller_config=self.controller_config)
+        # HAL commands from the API bypass the command queue; have them
+        # flag the state as changed so it is pushed while paused too
+        self._state_changed = False
+        self.swarm.on_hal_command = self.mark_state_changed
 
         # Load obstacle scene from config
         obstacle_cfg = self.config.get('obstacles', {})
@@ -141,8 +145,10 @@ class Simulator:
         # Auto-spawn tracking
         self.auto_spawn_triggered = False
         
-        # Central command queue (thread-safe)
-        self._cmd_queue = queue.Queue()
+        # Central command queue. deque append/popleft are atomic, so
+        # producers on other threads need no lock, and an empty queue is a
+        # length check rather than a raised queue.Empty every tick
+        self._cmd_queue = deque()
         self._max_dt = 0.1  # Maximum time step to prevent instability
         self._tick_sleep = 1.0 / self.config['simulation']['update_rate']
         
@@ -155,10 +161,38 @@ class Simulator:
         # Thread management - simplified and safe
         self._thread: Optional[threading.Thread] = None
         self._last_tick_ts = 0.0
+        # Monotonic counter bumped after every loop pass (paused or not) and
+        # every manual step; state snapshots can be cached per tick
+        self.tick = 0
+        # Active position recordings, filled from inside the sim loop
+        self._recordings = []
         
     def set_state_callback(self, callback: Callable):
-        """Set callback function that receives drone state updates."""
+        """Set callback function that receives drone state updates.
+
+        The callback is called as callback(states, sim_info) from the
+        simulation thread, where states is a SwarmStateArrays snapshot.
+        It runs every tick; while paused, only after commands ran or
+        mark_state_changed() was called.
+        """
         self.state_update_callback = callback
+
+    def mark_state_changed(self):
+        """Push a new snapshot on the next tick, even while paused.
+
+        For changes made outside the command queue (HAL commands, wind
+        settings); thread-safe.
+        """
+        self._state_changed = True
+
+    def _push_state(self):
+        """Hand the current swarm snapshot to the state callback.
+
+        Must be called with self.lock held.
+        """
+        if self.state_update_callback:
+            self.state_update_callback(self.swarm.get_state_arrays(),
+                                       self.get_simulation_info())
         
     def start(self):
         """Start the simulation thread - safe to call multiple times."""
@@ -186,12 +220,12 @@ class Simulator:
         return bool(self._thread) and self._thread.is_alive()
     
     def last_tick_time(self) -> float:
-        """Get timestamp of last simulation tick."""
+        """Get time.perf_counter() timestamp of last simulation tick."""
         return self._last_tick_ts
     
     def queue_size(self) -> int:
         """Get current command queue size."""
-        return self._cmd_queue.qsize()
+        return len(self._cmd_queue)
             
     def pause(self):
         """Pause the simulation."""
@@ -205,12 +239,10 @@ class Simulator:
         """Step the simulation by one tick (useful when paused)."""
         with self.lock:
             self.swarm.update(self.dt)
+            self.tick += 1
             
             # Send state update to callback
-            if self.state_update_callback:
-                states = self.swarm.get_states()
-                sim_info = self.get_simulation_info()
-                self.state_update_callback(states, sim_info)
+            self._push_state()
         
     def set_formation(self, formation_type: str):
         """Set the formation pattern for the swarm."""
@@ -317,11 +349,93 @@ class Simulator:
         with self.lock:
             return self.swarm.get_all_hals()
 
+    def get_avoidance_config(self) -> Dict[str, Any]:
+        """Get the swarm-wide obstacle avoidance settings."""
+        c = self.controller_config
+        return {
+            'enabled': c.avoidance_enabled,
+            'sensor_range': c.avoidance_sensor_range,
+            'repulsion_gain': c.avoidance_repulsion_gain,
+            'velocity_limit': c.avoidance_velocity_limit,
+        }
+
+    def set_avoidance_config(self, enabled: bool, sensor_range: float,
+                             repulsion_gain: float, velocity_limit: float):
+        """Apply obstacle avoidance settings to every drone.
+
+        Also updates the controller config so respawned drones inherit them.
+        """
+        with self.lock:
+            c = self.controller_config
+            c.avoidance_enabled = enabled
+            c.avoidance_sensor_range = sensor_range
+            c.avoidance_repulsion_gain = repulsion_gain
+            c.avoidance_velocity_limit = velocity_limit
+            for drone in self.swarm.drones:
+                ac = drone.controller.avoidance.config
+                ac.enabled = enabled
+                ac.sensor_range = sensor_range
+                ac.repulsion_gain = repulsion_gain
+                ac.velocity_limit = velocity_limit
+
     def get_drone_states(self) -> list:
         """Get current state of all drones."""
         with self.lock:
             return self.swarm.get_states()
+
+    def get_state_arrays(self):
+        """Get current state of all drones as a SwarmStateArrays snapshot."""
+        with self.lock:
+            return self.swarm.get_state_arrays()
             
+    def record_positions(self, duration: float, rate: float = 10.0) -> np.ndarray:
+        """Record true positions of all drones for `duration` seconds.
+
+        Samples are copied inside the simulation loop at `rate` Hz into a
+        preallocated (n_samples, n_drones, 3) array, so the caller does not
+        poll per drone. Blocks until the recording is complete and returns
+        the array; rows that could not be filled (simulation stopped, or the
+        drone count changed) are left as NaN. Drone columns follow swarm order.
+        """
+        n_samples = max(1, int(round(duration * rate)))
+        with self.lock:
+            n_drones = len(self.swarm.drones)
+            recording = {
+                'buffer': np.full((n_samples, n_drones, 3), np.nan),
+                'interval': 1.0 / rate,
+                'next_time': 0.0,
+                'index': 0,
+                'done': threading.Event(),
+            }
+            self._recordings.append(recording)
+        recording['done'].wait(timeout=duration + 2.0)
+        with self.lock:
+            # Match by identity: dict == would compare the numpy buffers
+            self._recordings = [r for r in self._recordings if r is not recording]
+        return recording['buffer']
+
+    def _sample_recordings(self, now: float):
+        """Copy current positions into every recording that is due (lock held)."""
+        drones = self.swarm.drones
+        finished = False
+        for recording in self._recordings:
+            if now < recording['next_time']:
+                continue
+            buffer = recording['buffer']
+            index = recording['index']
+            row = buffer[index]
+            if len(drones) == len(row):
+                for j, drone in enumerate(drones):
+                    row[j] = drone.physics.position
+            recording['index'] = index + 1
+            recording['next_time'] = now + recording['interval']
+            if recording['index'] == len(buffer):
+                finished = True
+                recording['done'].set()
+        if finished:
+            self._recordings = [r for r in self._recordings
+                                if r['index'] < len(r['buffer'])]
+
     def get_simulation_info(self) -> Dict[str, Any]:
         """Get general simulation information."""
         with self.lock:
@@ -345,8 +459,8 @@ class Simulator:
             
     def enqueue(self, cmd: str, payload: Optional[Dict[str, Any]] = None):
         """Enqueue a command for processing by the simulation thread."""
-        self._cmd_queue.put((cmd, payload or {}))
-        print(f"[SIM] queued {cmd} size={self._cmd_queue.qsize()}")
+        self._cmd_queue.append((cmd, payload or {}))
+        print(f"[SIM] queued {cmd} size={len(self._cmd_queue)}")
             
     def _simulation_loop(self):
         """Main simulation loop running in separate thread.
@@ -369,11 +483,9 @@ class Simulator:
             
             # Process up to 8 commands per tick
             cmds = 0
-            while cmds < 8:
-                try:
-                    cmd, payload = self._cmd_queue.get_nowait()
-                except queue.Empty:
-                    break
+            cmd_queue = self._cmd_queue
+            while cmds < 8 and cmd_queue:
+                cmd, payload = cmd_queue.popleft()
                     
                 print(f"[SIM] processing {cmd} {payload}")
                 try:
@@ -381,10 +493,7 @@ class Simulator:
                         with self.lock:
                             self.swarm.respawn_formation(**payload)
                             # Immediate state push
-                            if self.state_update_callback:
-                                states = self.swarm.get_states()
-                                info = self.get_simulation_info()
-                                self.state_update_callback(states, info)
+                            self._push_state()
                             print(f"[SIM] respawn complete: N={len(self.swarm.drones)}")
                     elif cmd == "SET_FORMATION":
                         with self.lock:
@@ -445,10 +554,7 @@ class Simulator:
                             config['up_axis']
                         )
                         # Immediate state push after auto-spawn
-                        if self.state_update_callback:
-                            states = self.swarm.get_states()
-                            info = self.get_simulation_info()
-                            self.state_update_callback(states, info)
+                        self._push_state()
                         print(f"[SIM] Auto-spawn completed: {len(self.swarm.drones)} drones created")
                 except Exception as e:
                     print(f"[SIM] Auto-spawn failed: {e}")
@@ -457,13 +563,18 @@ class Simulator:
             with self.lock:
                 if not self.paused:
                     self.swarm.update(dt, self.environment)
-                # ALWAYS push state (paused or not)
-                if self.state_update_callback:
-                    states = self.swarm.get_states()
-                    info = self.get_simulation_info()
-                    self.state_update_callback(states, info)
+                if self._recordings:
+                    self._sample_recordings(time.perf_counter())
+                # Push every tick while running; while paused only after
+                # something changed, since the snapshot is otherwise the same.
+                # Clear the flag before pushing so a change made meanwhile
+                # is either in this snapshot or flagged for the next
+                if not self.paused or cmds or self._state_changed:
+                    self._state_changed = False
+                    self._push_state()
+                self.tick += 1
             
-            self._last_tick_ts = time.time()
+            self._last_tick_ts = time.perf_counter()
             time.sleep(self._tick_sleep)
         
         print("[SIM] _simulation_loop EXIT")
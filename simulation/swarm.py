@@ -1,12 +1,86 @@
+import heapq
 import numpy as np
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Any, Optional
 import math
 from simulation.drone import Drone
+from simulation.physics import quat_to_euler
 from simulation.spawn import make_positions
 from simulation.coords import map_positions_list
 from simulation.obstacles import ObstacleManager
 from hal.sim_hal import SimHAL
 
+@dataclass
+class SwarmStateArrays:
+    """Structure-of-arrays snapshot of every drone's state.
+
+    Vector fields are contiguous (N, 3) / (N, 4) float arrays so consumers
+    (state frames, collision/avoidance passes) can work on whole columns
+    instead of N small per-drone arrays.
+
+    Attributes:
+        ids: Drone IDs, int32 (N,).
+        positions: World positions (N, 3).
+        velocities: World velocities (N, 3).
+        targets: Target positions (N, 3).
+        orientations: Euler angles [roll, pitch, yaw] in radians (N, 3).
+        angular_velocities: Body rates (N, 3).
+        motor_rpms: Motor speeds (N, 4).
+        colors: RGB colors (N, 3).
+        settled, crashed: Bool masks (N,).
+        battery, armed, modes: Per-drone scalars.
+    """
+    ids: np.ndarray
+    positions: np.ndarray
+    velocities: np.ndarray
+    targets: np.ndarray
+    orientations: np.ndarray
+    angular_velocities: np.ndarray
+    motor_rpms: np.ndarray
+    colors: np.ndarray
+    battery: List[float]
+    settled: np.ndarray
+    armed: List[bool]
+    modes: List[str]
+    crashed: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index_of(self, drone_id: int) -> Optional[int]:
+        """Row index of the drone with the given ID, or None if absent."""
+        hits = np.flatnonzero(self.ids == drone_id)
+        return int(hits[0]) if len(hits) else None
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Expand into per-drone dicts matching Drone.get_state()."""
+        return [
+            {
+                'id': drone_id,
+                'position': pos,
+                'velocity': vel,
+                'target': target,
+                'color': color,
+                'battery': battery,
+                'settled': settled,
+                'orientation': euler,
+                'angular_velocity': ang_vel,
+                'motor_rpms': rpms,
+                'armed': armed,
+                'mode': mode,
+                'crashed': crashed,
+            }
+            for drone_id, pos, vel, target, color, battery, settled,
+                euler, ang_vel, rpms, armed, mode, crashed in zip(
+                self.ids.tolist(), self.positions.tolist(),
+                self.velocities.tolist(), self.targets.tolist(),
+                self.colors.tolist(), self.battery, self.settled.tolist(),
+                self.orientations.tolist(), self.angular_velocities.tolist(),
+                self.motor_rpms.tolist(), self.armed, self.modes,
+                self.crashed.tolist())
+        ]
+
+
 class Swarm:
     """Manages multiple drones and formation control."""
 
@@ -32,6 +106,8 @@ class Swarm:
         self.obstacles = ObstacleManager()
         self.drones = []
         self._hal_instances: Dict[int, SimHAL] = {}
+        # Called after any HAL command (see SimHAL); set by the Simulator
+        self.on_hal_command: Optional[Callable[[], None]] = None
 
         # Create initial drones using spawn positions (only if num_drones > 0)
         if num_drones > 0:
@@ -57,7 +133,11 @@ class Swarm:
             # Set both position and target to spawned location
             drone.target_position = np.array(position, dtype=float)
             self.drones.append(drone)
-            self._hal_instances[i] = SimHAL(drone)
+            self._hal_instances[i] = SimHAL(drone, self._hal_commanded)
+
+    def _hal_commanded(self):
+        if self.on_hal_command is not None:
+            self.on_hal_command()
         
     def get_hal(self, drone_id: int) -> Optional[SimHAL]:
         """Get the HAL interface for a specific drone.
@@ -89,7 +169,8 @@ class Swarm:
     def _detect_collisions(self):
         """Detect and resolve drone-to-drone collisions.
 
-        Uses N^2 pairwise sphere-sphere checks. Applies elastic collision
+        Finds overlapping pairs with one vectorized distance pass, then
+        resolves them in pairwise order. Applies elastic collision
         response with configurable restitution and marks drones as crashed
         if relative impact speed exceeds the crash threshold.
         """
@@ -102,49 +183,75 @@ class Swarm:
         crash_speed = cfg.get('crash_speed', 8.0)
         min_dist = 2.0 * radius
 
-        n = len(self.drones)
-        for i in range(n):
-            for j in range(i + 1, n):
-                di = self.drones[i]
-                dj = self.drones[j]
-
-                # Skip pairs where both are already crashed
-                if di.crashed and dj.crashed:
-                    continue
-
-                pi = di.physics.position
-                pj = dj.physics.position
-                delta = pj - pi
-                dist = np.linalg.norm(delta)
-
-                if dist < min_dist and dist > 1e-8:
-                    # Collision normal (i -> j)
-                    normal = delta / dist
-
-                    # Separate overlapping drones (push apart equally)
-                    overlap = min_dist - dist
-                    pi -= normal * (overlap * 0.5)
-                    pj += normal * (overlap * 0.5)
-                    di.physics.position = pi
-                    dj.physics.position = pj
-
-                    # Relative velocity along collision normal
-                    v_rel = dj.physics.velocity - di.physics.velocity
-                    v_normal = np.dot(v_rel, normal)
-
-                    # Only resolve if drones are approaching
-                    if v_normal < 0:
-                        impact_speed = abs(v_normal)
-
-                        # Elastic collision impulse (equal mass)
-                        impulse = (1.0 + restitution) * v_normal * 0.5
-                        di.physics.velocity += impulse * normal
-                        dj.physics.velocity -= impulse * normal
-
-                        # Crash check
-                        if impact_speed > crash_speed:
-                            di.crashed = True
-                            dj.crashed = True
+        # Broad phase: all pairwise distances at once. Pairs are then resolved
+        # in nested-loop (i, j) order from a heap; when a push moves a drone,
+        # the later pairs it now overlaps are queued, so the result matches a
+        # full O(N^2) Python pass
+        drones = self.drones
+        n = len(drones)
+        reach_sq = (min_dist * 1.000001) ** 2  # slack: the norm test below decides
+        if n > 1:
+            positions = np.array([d.physics.position for d in drones])
+            offsets = positions[None, :, :] - positions[:, None, :]
+            close = np.einsum('ijk,ijk->ij', offsets, offsets) < reach_sq
+            rows, cols = np.nonzero(np.triu(close, k=1))
+            pending = list(zip(rows.tolist(), cols.tolist()))
+        else:
+            pending = []
+        queued = set(pending)
+        while pending:
+            pair = heapq.heappop(pending)
+            i, j = pair
+            di = drones[i]
+            dj = drones[j]
+
+            # Skip pairs where both are already crashed
+            if di.crashed and dj.crashed:
+                continue
+
+            pi = di.physics.position
+            pj = dj.physics.position
+            delta = pj - pi
+            dist = np.linalg.norm(delta)
+
+            if dist < min_dist and dist > 1e-8:
+                # Collision normal (i -> j)
+                normal = delta / dist
+
+                # Separate overlapping drones (push apart equally)
+                overlap = min_dist - dist
+                pi -= normal * (overlap * 0.5)
+                pj += normal * (overlap * 0.5)
+                di.physics.position = pi
+                dj.physics.position = pj
+                positions[i] = pi
+                positions[j] = pj
+                for k in pair:
+                    offsets = positions - positions[k]
+                    near = np.nonzero(np.einsum('ij,ij->i', offsets, offsets) < reach_sq)[0]
+                    for m in near.tolist():
+                        later = (k, m) if k < m else (m, k)
+                        if m != k and later > pair and later not in queued:
+                            queued.add(later)
+                            heapq.heappush(pending, later)
+
+                # Relative velocity along collision normal
+                v_rel = dj.physics.velocity - di.physics.velocity
+                v_normal = np.dot(v_rel, normal)
+
+                # Only resolve if drones are approaching
+                if v_normal < 0:
+                    impact_speed = abs(v_normal)
+
+                    # Elastic collision impulse (equal mass)
+                    impulse = (1.0 + restitution) * v_normal * 0.5
+                    di.physics.velocity += impulse * normal
+                    dj.physics.velocity -= impulse * normal
+
+                    # Crash check
+                    if impact_speed > crash_speed:
+                        di.crashed = True
+                        dj.crashed = True
 
         # Drone-to-obstacle collisions
         for drone in self.drones:
@@ -240,6 +347,33 @@ class Swarm:
     def get_states(self) -> List[Dict[str, Any]]:
         """Get current state of all drones."""
         return [drone.get_state() for drone in self.drones]
+
+    def get_state_arrays(self) -> SwarmStateArrays:
+        """Get current state of all drones as a structure of arrays.
+
+        Gathers each field into one array and converts all orientations in
+        a single vectorized quat_to_euler call.
+        """
+        drones = self.drones
+        n = len(drones)
+        physics = [drone.physics for drone in drones]
+        controllers = [drone.controller for drone in drones]
+        quats = np.array([p.orientation for p in physics]).reshape(n, 4)
+        return SwarmStateArrays(
+            ids=np.array([drone.id for drone in drones], dtype=np.int32),
+            positions=np.array([p.position for p in physics]).reshape(n, 3),
+            velocities=np.array([p.velocity for p in physics]).reshape(n, 3),
+            targets=np.array([drone.target_position for drone in drones]).reshape(n, 3),
+            orientations=quat_to_euler(quats.T).T,
+            angular_velocities=np.array([p.angular_velocity for p in physics]).reshape(n, 3),
+            motor_rpms=np.array([p.motor_rpms for p in physics]).reshape(n, 4),
+            colors=np.array([drone.color[:3] for drone in drones], dtype=float).reshape(n, 3),
+            battery=[drone.battery_level for drone in drones],
+            settled=np.array([drone.settled for drone in drones], dtype=bool),
+            armed=[c.armed for c in controllers],
+            modes=[c.mode for c in controllers],
+            crashed=np.array([drone.crashed for drone in drones], dtype=bool),
+        )
         
     def is_formation_complete(self) -> bool:
         """Check if formation is complete (90% of drones settled)."""
@@ -7,6 +7,7 @@ import sys
 import os
 import json
 import time
+import asyncio
 import pytest
 import numpy as np
 
@@ -15,8 +16,9 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from fastapi.testclient import TestClient
 from simulation.simulator import Simulator
-from api.server import create_app
+from api.server import create_app, ConnectionManager
 from api.serializers import (
+    dumps,
     serialize_imu,
     serialize_gps,
     serialize_altitude,
@@ -115,6 +117,32 @@ class TestSerializers:
         assert d['id'] == 0
         assert isinstance(d['velocity'], list)
 
+    def test_packb_numpy_ext(self):
+        msgpack = pytest.importorskip("msgpack")
+        from api.serializers import packb, NDARRAY_EXT_CODE
+
+        arr = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+        d = msgpack.unpackb(packb({'positions': arr, 'flag': np.bool_(True)}))
+        ext = d['positions']
+        assert ext.code == NDARRAY_EXT_CODE
+        dtype, shape, buf = msgpack.unpackb(ext.data)
+        restored = np.frombuffer(buf, dtype=dtype).reshape(shape)
+        assert np.array_equal(restored, arr)
+        assert d['flag'] is True
+
+    def test_dumps_numpy(self):
+        data = {
+            'contiguous': np.array([1.0, 2.0, 3.0]),
+            'strided': np.arange(6.0)[::2],
+            'flag': np.bool_(True),
+            'count': np.int32(4),
+        }
+        d = json.loads(dumps(data))
+        assert d['contiguous'] == [1.0, 2.0, 3.0]
+        assert d['strided'] == [0.0, 2.0, 4.0]
+        assert d['flag'] is True
+        assert d['count'] == 4
+
 
 # ── REST endpoint tests ──────────────────────────────────────────
 
@@ -144,6 +172,26 @@ class TestSimulationEndpoints:
         assert r.json()['status'] == 'stepped'
         client.post("/api/sim/resume")
 
+    def test_hal_command_pushes_state_while_paused(self, client, simulator):
+        pushed = []
+        simulator.pause()
+        time.sleep(0.2)
+        simulator.set_state_callback(lambda states, info: pushed.append(states))
+        try:
+            time.sleep(0.2)
+            assert not pushed  # nothing changed: no pushes while paused
+            r = client.post("/api/drones/0/command/position",
+                            json={"x": 1.0, "y": 7.0, "z": -2.0})
+            assert r.status_code == 200
+            time.sleep(0.2)
+            assert pushed
+            idx = int(np.flatnonzero(pushed[-1].ids == 0)[0])
+            assert pushed[-1].targets[idx].tolist() == [1.0, 7.0, -2.0]
+        finally:
+            simulator.set_state_callback(None)
+            simulator.resume()
+            time.sleep(0.1)
+
 
 class TestDroneEndpoints:
     def test_list_drones(self, client):
@@ -159,6 +207,18 @@ class TestDroneEndpoints:
         data = r.json()
         assert data['id'] == 0
 
+    def test_get_drone_matches_list_within_tick(self, client, simulator):
+        simulator.pause()
+        time.sleep(0.2)
+        tick = simulator.tick
+        listed = client.get("/api/drones").json()
+        single = client.get(f"/api/drones/{listed[-1]['id']}").json()
+        assert single == listed[-1]
+        time.sleep(0.2)
+        assert simulator.tick > tick  # loop keeps ticking while paused
+        simulator.resume()
+        time.sleep(0.1)
+
     def test_get_drone_not_found(self, client):
         r = client.get("/api/drones/9999")
         assert r.status_code == 404
@@ -217,6 +277,17 @@ class TestDroneCommands:
         assert r.status_code == 200
         assert r.json()['drone_id'] == 0
 
+    def test_set_position_invalid_body(self, client):
+        r = client.post("/api/drones/0/command/position",
+                        json={"x": "not a number", "y": 0.0})
+        assert r.status_code == 422
+        locs = [tuple(e['loc']) for e in r.json()['detail']]
+        assert ('body', 'x') in locs
+        assert ('body', 'z') in locs
+        # Same error shape as FastAPI's own body validation (no 'url')
+        for err in r.json()['detail']:
+            assert set(err) == {'type', 'loc', 'msg', 'input'}
+
     def test_set_velocity(self, client):
         r = client.post("/api/drones/0/command/velocity",
                         json={"vx": 1.0, "vy": 0.0, "vz": 0.0})
@@ -291,6 +362,20 @@ class TestObstacleEndpoints:
 
 # ── WebSocket tests ──────────────────────────────────────────────
 
+class TestAvoidanceEndpoints:
+    def test_set_avoidance_applies_to_all_drones(self, client, simulator):
+        original = client.get("/api/avoidance").json()
+        cfg = {"enabled": True, "sensor_range": 7.5,
+               "repulsion_gain": 4.0, "velocity_limit": 1.5}
+        r = client.post("/api/avoidance", json=cfg)
+        assert r.status_code == 200
+        assert client.get("/api/avoidance").json() == cfg
+        for hal in simulator.get_all_hals().values():
+            ac = hal._drone.controller.avoidance.config
+            assert ac.enabled and ac.sensor_range == 7.5
+        client.post("/api/avoidance", json=original)
+
+
 class TestWebSocket:
     def test_ws_receives_state(self, client):
         """WebSocket should receive a state_update frame."""
@@ -312,9 +397,97 @@ class TestWebSocket:
             data = ws.receive_json()
             assert data['type'] == 'state_update'
 
+    def test_ws_producer_survives_failed_frame(self, client, simulator, monkeypatch):
+        """A tick that fails to build a frame is skipped, not fatal."""
+        get_info = simulator.get_simulation_info
+        calls = []
+
+        def flaky_info():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("transient")
+            return get_info()
+
+        monkeypatch.setattr(simulator, 'get_simulation_info', flaky_info)
+        with client.websocket_connect("/api/ws") as ws:
+            time.sleep(0.35)
+            # Checked before receiving: a dead producer would block forever
+            assert len(calls) > 1
+            data = ws.receive_json()
+            assert data['type'] == 'state_update'
+
+    def test_ws_binary_receives_state(self, client):
+        """Binary endpoint should stream the same frame as msgpack."""
+        msgpack = pytest.importorskip("msgpack")
+        with client.websocket_connect("/api/ws/bin") as ws:
+            data = msgpack.unpackb(ws.receive_bytes())
+            assert data['type'] == 'state_update'
+            assert 'drones' in data
+
     def test_ws_invalid_json(self, client):
         """Invalid JSON should not crash the connection."""
         with client.websocket_connect("/api/ws") as ws:
             ws.send_text("not valid json {{{")
             data = ws.receive_json()
             assert data['type'] == 'state_update'
+
+
+class _FakeSocket:
+    """Minimal stand-in for a Starlette WebSocket in manager tests."""
+
+    def __init__(self, fail=False, delay=0.0):
+        self.fail = fail
+        self.delay = delay
+        self.sent = []
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("socket closed")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(text)
+
+
+class TestConnectionManager:
+    def test_publish_encodes_once_and_prunes_dead(self):
+        async def scenario():
+            manager = ConnectionManager()
+            good_a, good_b, dead = _FakeSocket(), _FakeSocket(), _FakeSocket(fail=True)
+            manager.active.update([good_a, dead, good_b])
+            senders = [asyncio.create_task(manager.stream(ws))
+                       for ws in (good_a, dead, good_b)]
+            await asyncio.sleep(0)
+
+            manager.publish({'type': 'state_update',
+                             'position': np.array([1.0, 2.0, 3.0])})
+            await asyncio.sleep(0)
+
+            for task in senders:
+                task.cancel()
+            return manager, good_a, good_b, dead
+
+        manager, good_a, good_b, dead = asyncio.run(scenario())
+        assert good_a.sent == good_b.sent
+        assert len(good_a.sent) == 1
+        assert json.loads(good_a.sent[0])['position'] == [1.0, 2.0, 3.0]
+        assert dead not in manager.active
+        assert len(manager.active) == 2
+
+    def test_frame_published_during_send_is_delivered(self):
+        async def scenario():
+            manager = ConnectionManager()
+            slow = _FakeSocket(delay=0.05)
+            manager.active.add(slow)
+            sender = asyncio.create_task(manager.stream(slow))
+            await asyncio.sleep(0)
+
+            manager.publish({'frame': 1})
+            await asyncio.sleep(0)  # sender is now inside send_text
+            manager.publish({'frame': 2})
+            await asyncio.sleep(0.2)  # producer idle from here on
+
+            sender.cancel()
+            return slow
+
+        slow = asyncio.run(scenario())
+        assert [json.loads(text)['frame'] for text in slow.sent] == [1, 2]
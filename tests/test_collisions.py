@@ -443,3 +443,44 @@ class TestEdgeCases:
 
         for drone in swarm.drones:
             assert not drone.crashed, "Respawned drones should not be crashed"
+
+    def test_state_arrays_match_get_states(self):
+        """SoA snapshot should expand to the same dicts as get_states()."""
+        swarm = make_swarm(3)
+        swarm.drones[1].crashed = True
+        for _ in range(20):
+            swarm.update(0.01)
+
+        arrays = swarm.get_state_arrays()
+        assert arrays.positions.shape == (3, 3)
+        assert arrays.motor_rpms.shape == (3, 4)
+        assert arrays.colors.shape == (3, 3)
+        assert arrays.crashed.tolist() == [False, True, False]
+
+        expected = swarm.get_states()
+        for got, want in zip(arrays.to_dicts(), expected):
+            assert got.keys() == want.keys()
+            for key in ('position', 'velocity', 'target', 'orientation',
+                        'angular_velocity', 'motor_rpms'):
+                np.testing.assert_allclose(got[key], want[key])
+            assert got['crashed'] == want['crashed']
+            assert got['settled'] == want['settled']
+            assert got['color'] == list(want['color'][:3])
+            assert got['id'] == want['id']
+
+    def test_state_arrays_empty_swarm(self):
+        """An empty swarm should produce empty, correctly shaped arrays."""
+        swarm = make_swarm(2)
+        swarm.drones = []
+        arrays = swarm.get_state_arrays()
+        assert arrays.positions.shape == (0, 3)
+        assert arrays.to_dicts() == []
+
+    def test_state_arrays_index_of(self):
+        """index_of should map drone IDs to rows, and len() count drones."""
+        swarm = make_swarm(3)
+        arrays = swarm.get_state_arrays()
+        assert len(arrays) == 3
+        idx = arrays.index_of(2)
+        np.testing.assert_allclose(arrays.positions[idx], swarm.drones[2].physics.position)
+        assert arrays.index_of(99) is None
@@ -0,0 +1,131 @@
+"""Tests for the GUI's paused-scene redraw tracking.
+
+Runs DroneSwarmGUI's frame logic without a window or GL context: the
+renderer, camera and overlay are replaced with recording fakes.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pytest
+
+pygame = pytest.importorskip("pygame")
+pytest.importorskip("OpenGL")
+
+from gui.main import DroneSwarmGUI
+
+
+class _FakeOverlay:
+    """Records draw calls; prepare() reports changes like TextOverlay."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.color = (255, 255, 255)
+        self._items = []
+        self._prepared = None
+        self.composed = []
+
+    def clear(self):
+        self._items = []
+
+    def __getattr__(self, name):
+        if not name.startswith('draw_'):
+            raise AttributeError(name)
+        return lambda *args: self._items.append(name)
+
+    def prepare(self):
+        if self._items == self._prepared:
+            return False
+        self._prepared = self._items
+        self.composed.append(list(self._items))
+        return True
+
+    def render_to_screen(self):
+        self.frames.append(('blit', list(self._prepared or ())))
+
+
+class _FakeRenderer:
+    def clear(self):
+        pass
+
+
+class _FakeCamera:
+    def __init__(self):
+        self.position = np.array([15.0, 15.0, 15.0])
+        self.target = np.array([0.0, 5.0, 0.0])
+        self.locked_drone_id = None
+
+    def apply_view_matrix(self):
+        pass
+
+
+@pytest.fixture
+def gui(monkeypatch):
+    frames = []
+    monkeypatch.setattr(pygame.display, 'flip', lambda: frames.append('flip'))
+    g = DroneSwarmGUI.__new__(DroneSwarmGUI)
+    g.frames = frames
+    g.renderer = _FakeRenderer()
+    g._batched_renderer = False
+    g.camera = _FakeCamera()
+    g.overlay = _FakeOverlay(frames)
+    g.enable_overlay = True
+    g.gamepad = type('Pad', (), {'connected': False, 'enabled': False})()
+    g.drone_states = type('States', (), {'to_dicts': lambda self: [],
+                                         '__len__': lambda self: 0})()
+    g.extrapolate_states = False
+    g._frame_states = g.drone_states
+    g.obstacle_states = []
+    g.sim_info = {}
+    g._current_formation = 'idle'
+    g._settled_count = 0
+    g._up_axis_label = "Up-axis: Y"
+    g._spawn_label = "Spawn: unknown"
+    g._last_frame_time = g.start_time = 0.0
+    g._hud_fps = g.fps = 60.0
+    g._hud_fps_time = 0.0
+    for flag in ('show_fps', 'show_sim_time', 'show_formation_type', 'show_grid',
+                 'show_axes', 'show_connections', 'show_targets', 'show_labels',
+                 'show_obstacles', 'show_help', 'fpv_mode', 'placement_mode',
+                 'placement_delete_mode'):
+        setattr(g, flag, False)
+    g.paused = True
+    g._scene_dirty = True
+    g._drawn_view = None
+    return g
+
+
+def _frame(gui):
+    if gui._needs_redraw():
+        gui.render()
+        return True
+    return False
+
+
+class TestPausedRedraw:
+    def test_idle_paused_scene_is_not_redrawn(self, gui):
+        assert _frame(gui)
+        assert _frame(gui)  # first HUD composed after the first swap
+        assert not _frame(gui)
+
+    def test_help_toggle_reaches_the_screen_while_paused(self, gui):
+        while _frame(gui):
+            pass
+        gui.frames.clear()
+
+        gui.show_help = True
+        gui._scene_dirty = True  # as handle_key_press does for H
+        assert _frame(gui)
+        # That frame blits the HUD composed before the key press, then
+        # composes the help panel after the swap...
+        assert gui.frames[0] == ('blit', gui.overlay.composed[-2])
+        assert 'draw_help_overlay' in gui.overlay.composed[-1]
+        # ...so one more frame must be drawn to show it
+        assert _frame(gui)
+        assert gui.frames[-2] == ('blit', gui.overlay.composed[-1])
+        assert gui.frames[-1] == 'flip'
+        assert not _frame(gui)
@@ -127,6 +127,17 @@ class TestObstacleManagerCRUD:
         assert states[1]['type'] == 'cylinder'
         assert states[1]['radius'] == 1.5
 
+    def test_get_states_reused_until_changed(self):
+        mgr = make_manager()
+        mgr.add_box([0, 0, 0], [1, 1, 1])
+        states = mgr.get_states()
+        assert mgr.get_states() is states
+        mgr.add_cylinder([5, 0, 0], 1.0, 2.0)
+        assert len(mgr.get_states()) == 2
+        mgr.remove_last()
+        mgr.clear_all()
+        assert mgr.get_states() == []
+
 
 # ===========================================================================
 # Sphere-AABB collision
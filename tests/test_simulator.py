@@ -0,0 +1,48 @@
+"""Tests for the Simulator thread's position recordings."""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from simulation.simulator import Simulator
+
+
+@pytest.fixture(scope="module")
+def simulator():
+    """A running simulator with its auto-spawned drones."""
+    sim = Simulator("config.yaml")
+    sim.start()
+    time.sleep(1.5)
+    yield sim
+    sim.stop()
+
+
+class TestRecordPositions:
+    def test_record_positions(self, simulator):
+        track = simulator.record_positions(0.5, rate=10.0)
+        assert track.shape == (5, len(simulator.get_state_arrays().ids), 3)
+        assert np.isfinite(track).all()
+        assert not simulator._recordings
+
+    def test_overlapping_recordings(self, simulator):
+        tracks = {}
+        long_rec = threading.Thread(
+            target=lambda: tracks.update(long=simulator.record_positions(1.0)))
+        long_rec.start()
+        time.sleep(0.1)
+        tracks['short'] = simulator.record_positions(0.3)
+        long_rec.join()
+
+        n_drones = len(simulator.get_state_arrays().ids)
+        assert tracks['short'].shape == (3, n_drones, 3)
+        assert tracks['long'].shape == (10, n_drones, 3)
+        assert np.isfinite(tracks['short']).all()
+        assert np.isfinite(tracks['long']).all()
+        assert not simulator._recordings
+        assert simulator.is_alive()